@@ -1,24 +1,66 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, abort, jsonify, g
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user, UserMixin
-from neo4j import GraphDatabase
-import networkx as nx
-from collections import defaultdict
+import hmac
+import os
+import threading
 import time
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import io
-import base64
+from cache import SingleFlight, TTLCache
+from coloring import jumlah_warna
+from compact_graph import CompactGraph
+from portfolio import run_portfolio
+from tabucol import improve_coloring
+from components import color_components
+from reduksi import clique_lower_bound, color_reduced
+from recolor import recolor_incremental
+from visual import get_png, graph_hash, graph_json
+from layout import layout_graph
+from jobs import get_job, submit as submit_job
+from metrics import register_collector, render_prometheus, request_seconds, span
+from storage import create_repository
 
 app = Flask(__name__)
 app.secret_key = "secretkey"
+app.config["CONFLICT_SOURCE"] = "edges"
+# Algoritma bila ?algo= tidak diberikan; coloring-greedy.py / coloring-dsatur.py
+# hanya mengganti nilai ini
+app.config["DEFAULT_ALGO"] = "welsh_powell"
+app.config["DEFAULT_BUDGET_MS"] = 500
+# Budget portfolio yang boleh dipilih admin (user lain selalu memakai default);
+# nilai lain dibulatkan ke pilihan terdekat, jadi kunci cache tetap sedikit
+app.config["BUDGET_MS_PILIHAN"] = (200, 500, 1000, 2000)
+# Bila pewarnaan butuh lebih dari TARGET_SLOT slot, tabu search dijalankan
+# maksimal TABU_MS milidetik untuk menurunkannya (0 = nonaktif)
+app.config["TARGET_SLOT"] = 5
+app.config["TABU_MS"] = 500
+# Kupas simpul berderajat rendah / terdominasi sebelum algoritma utama.
+# Hanya untuk solver mahal: untuk heuristik tunggal reduksinya lebih lama
+# daripada pewarnaan itu sendiri.
+app.config["REDUKSI_ALGO"] = ("portfolio",)
+# Buat constraint/index Neo4j (idempoten) saat server dijalankan
+app.config["SCHEMA_BOOTSTRAP"] = True
+# /metrics hanya untuk alamat di METRICS_IZIN, atau dengan header
+# "Authorization: Bearer <METRICS_TOKEN>" (mis. Prometheus di host lain)
+app.config["METRICS_TOKEN"] = os.environ.get("GRAFCOLORING_METRICS_TOKEN")
+app.config["METRICS_IZIN"] = ("127.0.0.1", "::1")
 
-# === Neo4j setup ===
-driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "admin123"))
+# === Penyimpanan ===
+# Neo4j secara default; GRAFCOLORING_STORAGE=memory memakai data di memori
+# (snapshot JSON atau universitas sintetis), lihat storage.py. Dibuat saat
+# pertama dipakai, bukan saat impor: worker pool (forkserver/spawn) mengimpor
+# ulang skrip ini dan tidak boleh ikut membuat driver atau memuat seluruh data.
+_repo = None
+_repo_lock = threading.Lock()
 
-# Helper agar selalu ke database 'grafcoloring'
-def get_session():
-    return driver.session(database="grafcoloring")
+def get_repo():
+    global _repo
+    with _repo_lock:
+        if _repo is None:
+            _repo = create_repository()
+        return _repo
+
+def init_schema():
+    if app.config["SCHEMA_BOOTSTRAP"]:
+        get_repo().ensure_schema()
 
 # === Login setup ===
 login_manager = LoginManager(app)
@@ -30,156 +72,256 @@ class User(UserMixin):
         self.nama = nama
         self.role = role
 
+# User yang sudah dibaca dari penyimpanan; tanpa ini setiap request terautentikasi
+# membayar satu query. Panggil invalidate_user() bila nama/role user berubah.
+user_cache = TTLCache(maxsize=1024, ttl=300)
+
+def fetch_user(user_id):
+    user = user_cache.get(user_id)
+    if user is None:
+        r = get_repo().get_user(user_id)
+        if not r:
+            return None
+        user = User(r["id"], r["nama"], r["role"])
+        user_cache.set(user_id, user)
+    return user
+
+def invalidate_user(user_id=None):
+    # Tanpa argumen: kosongkan seluruh cache user
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(user_id)
+
 @login_manager.user_loader
 def load_user(user_id):
-    with get_session() as s:
-        r = s.run(
-            "MATCH (u:User {id:$id}) RETURN u.id AS id, u.nama AS nama, u.role AS role",
-            id=user_id
-        ).single()
-    if r:
-        return User(r["id"], r["nama"], r["role"])
-    return None
+    return fetch_user(user_id)
 
 # === Graph Coloring Functions ===
 
 def fetch_conflicts():
-    with get_session() as session:
-        session.run("MATCH (:MataKuliah)-[r:BERTABRAKAN_DOSEN]->(:MataKuliah) DELETE r")
-        session.run("MATCH (:MataKuliah)-[r:BERTABRAKAN_MAHASISWA]->(:MataKuliah) DELETE r")
-        session.run("MATCH (:MataKuliah)-[r:BERTABRAKAN_RUANGAN]->(:MataKuliah) DELETE r")
-
-        # Cek bentrok mahasiswa
-        session.run("""
-            MATCH (m:User {role:'Mahasiswa'})-[:MENGAMBIL]->(c1:MataKuliah),
-                  (m)-[:MENGAMBIL]->(c2:MataKuliah)
-            WHERE c1 <> c2 AND c1.kode < c2.kode
-            MERGE (c1)-[:BERTABRAKAN_MAHASISWA]->(c2)
-        """)
-
-        # Cek bentrok dosen
-        session.run("""
-            MATCH (d:User {role:'Dosen'})-[:MENGAJAR]->(c1:MataKuliah),
-                  (d)-[:MENGAJAR]->(c2:MataKuliah)
-            WHERE c1 <> c2 AND c1.kode < c2.kode
-            MERGE (c1)-[:BERTABRAKAN_DOSEN]->(c2)
-        """)
-
-        # Cek bentrok ruangan
-        session.run("""
-            MATCH (c1:MataKuliah), (c2:MataKuliah)
-            WHERE c1.ruangan IS NOT NULL AND c2.ruangan IS NOT NULL
-              AND c1.ruangan = c2.ruangan AND c1.kode < c2.kode
-            MERGE (c1)-[:BERTABRAKAN_RUANGAN]->(c2)
-        """)
-
-        result = session.run("""
-            MATCH (c1:MataKuliah)-[r]->(c2:MataKuliah)
-            WHERE type(r) IN ['BERTABRAKAN_MAHASISWA', 'BERTABRAKAN_DOSEN', 'BERTABRAKAN_RUANGAN']
-            RETURN DISTINCT c1.kode AS mk1, c2.kode AS mk2
-        """)
-        return [(r["mk1"], r["mk2"]) for r in result]
+    # Hanya membaca edge bentrok; pembaruan dilakukan saat data MK berubah.
+    # CONFLICT_SOURCE="sparse": bentrok mahasiswa/dosen dihitung langsung dari
+    # MENGAMBIL/MENGAJAR (AᵀA), tanpa bergantung pada relasi yang tersimpan.
+    return get_repo().conflicts(app.config["CONFLICT_SOURCE"])
+
+def fetch_room_cliques():
+    # MK di ruangan yang sama saling bentrok semua: dikirim sebagai klik, bukan N² edge
+    return get_repo().room_cliques()
+
+def fetch_course_codes():
+    return get_repo().course_codes()
+
+def fetch_course_rooms():
+    return get_repo().course_rooms()
 
 def build_graph():
-    start = time.time()
-    G = nx.Graph()
-    conflicts = fetch_conflicts()
-    G.add_edges_from(conflicts)
-    duration = time.time() - start
+    # Semua MK masuk graf, termasuk yang tanpa konflik, supaya tetap dapat slot
+    start = time.perf_counter()
+    with span("conflict_query"):
+        conflicts = fetch_conflicts()
+        nodes = fetch_course_codes()
+        cliques = fetch_room_cliques()
+    with span("graph_build"):
+        G = CompactGraph.from_edges(conflicts, nodes=nodes, cliques=cliques)
+    duration = time.perf_counter() - start
     return G, duration
 
-def welsh_powell_coloring(G):
-    start = time.time()
-    nodes_sorted = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
-    coloring = {}
-    current_color = 0
-    for node in nodes_sorted:
-        if node in coloring:
-            continue
-        coloring[node] = current_color
-        for other in nodes_sorted:
-            if other not in coloring and all(
-                neighbor not in coloring or coloring[neighbor] != current_color
-                for neighbor in G.neighbors(other)
-            ):
-                coloring[other] = current_color
-        current_color += 1
-    duration = time.time() - start
-    return current_color, coloring, duration
+ALGO_LABEL = {
+    "welsh_powell": "Welsh-Powell",
+    "greedy": "Greedy",
+    "dsatur": "DSATUR",
+    "portfolio": "Portfolio",
+}
+
+def color_graph(G, algo, budget_ms):
+    # algo="portfolio": semua strategi paralel, ambil slot paling sedikit.
+    # Algoritma tunggal dijalankan per komponen terhubung secara paralel.
+    # Untuk algo di REDUKSI_ALGO, algoritma tersebut hanya melihat kernel graf.
+    start = time.perf_counter()
+    info = {}
+
+    def solver(K):
+        if algo == "portfolio":
+            coloring, hasil = run_portfolio(K, budget_ms=budget_ms)
+            info.update(hasil)
+        else:
+            coloring, info["komponen"] = color_components(K, algo)
+        return coloring
+
+    with span("coloring"):
+        if algo in app.config["REDUKSI_ALGO"]:
+            coloring, info["reduksi"] = color_reduced(G, solver)
+        else:
+            coloring = solver(G)
+    target = app.config["TARGET_SLOT"]
+    if app.config["TABU_MS"] > 0 and jumlah_warna(coloring) > target:
+        # Tanpa batas bawah, graf dengan klik > TARGET_SLOT menghabiskan seluruh
+        # TABU_MS untuk k yang mustahil dicapai
+        lower = info["reduksi"]["lower"] if "reduksi" in info else clique_lower_bound(G)
+        with span("tabu"):
+            coloring, info["tabu"] = improve_coloring(
+                G, coloring, target_k=target, time_limit=app.config["TABU_MS"] / 1000, lower_bound=lower
+            )
+    chromatic_number = jumlah_warna(coloring)
+    duration = time.perf_counter() - start
+    return chromatic_number, coloring, duration, info
+
+def get_algo():
+    algo = request.values.get("algo", app.config["DEFAULT_ALGO"])
+    if algo not in ALGO_LABEL:
+        abort(400, f"Algoritma tidak dikenal: {algo}")
+    budget_ms = app.config["DEFAULT_BUDGET_MS"]
+    diminta = request.values.get("budget_ms", type=int)
+    if diminta is not None and current_user.is_authenticated and current_user.role == "Admin":
+        budget_ms = min(app.config["BUDGET_MS_PILIHAN"], key=lambda b: (abs(b - diminta), b))
+    return algo, budget_ms
+
+# Cache graf + pewarnaan, kuncinya versi data di node Meta dan algoritma
+graph_cache = TTLCache(maxsize=8, ttl=300)
+# Saat lonjakan request, hanya satu yang membaca versi / menghitung pewarnaan
+# untuk kunci yang sama; sisanya menunggu dan memakai hasil yang sama
+inflight = SingleFlight()
+
+def read_data_version():
+    return get_repo().data_version()
+
+def get_colored_graph(algo, budget_ms):
+    versi = inflight.do("versi", read_data_version)
+    key = (versi, algo, budget_ms if algo == "portfolio" else None)
+    entry = graph_cache.get(key)
+    if entry is None:
+        entry = inflight.do(key, lambda: compute_colored_graph(key, algo, budget_ms))
+    return entry
+
+def compute_colored_graph(key, algo, budget_ms):
+    # Cek ulang: request sebelumnya mungkin baru saja mengisi cache
+    entry = graph_cache.get(key)
+    if entry is None:
+        G, time_graph = build_graph()
+        chromatic_num, pewarnaan, time_coloring, info = color_graph(G, algo, budget_ms)
+        entry = (G, chromatic_num, pewarnaan, time_graph, time_coloring, info)
+        graph_cache.set(key, entry)
+    return entry
 
 # Sesuaikan sesuai laporanmu:
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]
+# Sesi 100 menit tiap 2 jam mulai 08:00; sesi terakhir 16:00-17:40
+SESI_PER_HARI = 5
+KAPASITAS_SLOT = len(HARI) * SESI_PER_HARI
+
 def slot_to_hari_jam(slot):
-    if slot == 0:
-        return "Senin", "08:00", "09:40"
-    elif slot == 1:
-        return "Selasa", "08:00", "09:40"
-    elif slot == 2:
-        return "Rabu", "08:00", "09:40"
-    elif slot == 3:
-        return "Kamis", "08:00", "09:40"
-    else:
-        return "Jumat", "08:00", "09:40"
+    # Slot 0-4 = sesi pertama Senin-Jumat, slot 5-9 = sesi kedua, dst.
+    # Slot berbeda tidak pernah jatuh di hari dan jam yang sama.
+    if not 0 <= slot < KAPASITAS_SLOT:
+        raise ValueError(f"Slot {slot + 1} di luar kapasitas {KAPASITAS_SLOT} slot per minggu.")
+    hari = HARI[slot % len(HARI)]
+    sesi = slot // len(HARI)
+    mulai = 8 * 60 + sesi * 120
+    selesai = mulai + 100
+    return hari, f"{mulai // 60:02d}:{mulai % 60:02d}", f"{selesai // 60:02d}:{selesai % 60:02d}"
 
 def fetch_jadwal_info():
-    data = defaultdict(list)
-    with get_session() as session:
-        result = session.run("""
-            MATCH (c:MataKuliah)-[:DIJADWALKAN]->(j:Jadwal)
-            RETURN c.kode AS kode, j.hari AS hari, 
-                   j.jam_mulai AS jam_mulai, j.jam_selesai AS jam_selesai, 
-                   j.slot AS slot, c.ruangan AS ruangan
-        """)
-        for r in result:
-            data[int(r["slot"])].append({
-                "kode": r["kode"],
-                "hari": r["hari"],
-                "jam_mulai": r["jam_mulai"],
-                "jam_selesai": r["jam_selesai"],
-                "ruangan": r["ruangan"]
-            })
-    return data
-
-def render_colored_graph(G, coloring):
-    plt.figure(figsize=(10, 8))
-    pos = nx.spring_layout(G, seed=42)
-    colors = [coloring.get(node, 0) for node in G.nodes()]
-    nx.draw(G, pos, with_labels=True, node_color=colors, cmap=plt.cm.Set3, node_size=800, font_size=10)
-    plt.title("Visualisasi Pewarnaan Graf")
-    img = io.BytesIO()
-    plt.savefig(img, format='png')
-    plt.close()
-    img.seek(0)
-    return base64.b64encode(img.read()).decode('utf-8')
+    return get_repo().schedule_info()
+
+LOD_MODES = ("auto", "penuh", "slot", "ego")
+
+def get_lod():
+    # lod: auto / penuh / slot (quotient per slot) / ego (butuh ?kode=)
+    lod = request.args.get("lod", "auto")
+    if lod not in LOD_MODES:
+        abort(400, f"Mode tampilan tidak dikenal: {lod}")
+    kode = request.args.get("kode") or None
+    if lod == "ego" and kode is None:
+        abort(400, "Mode ego butuh ?kode=.")
+    return lod, kode if lod == "ego" else None
+
+def graph_title(algo):
+    return f"Visualisasi Pewarnaan Graf ({ALGO_LABEL[algo]})"
 
 # === Routes ===
 
 @app.route("/")
 @login_required
 def jadwal():
-    total_start = time.time()
-    G, time_graph = build_graph()
-    chromatic_num, pewarnaan, time_coloring = welsh_powell_coloring(G)
-    total_exec_time = time.time() - total_start
-    graph_img = render_colored_graph(G, pewarnaan)
-    latency = total_exec_time
-    jumlah_konflik = G.number_of_edges()
-    throughput = jumlah_konflik / latency if latency > 0 else 0
-
-    return render_template("index.html",
-        slot_map=fetch_jadwal_info(),
-        jumlah_simpul=G.number_of_nodes(),
-        jumlah_konflik=jumlah_konflik,
-        chromatic_number=chromatic_num,
-        pewarnaan=pewarnaan,
-        nama=current_user.nama,
-        role=current_user.role,
-        exec_time=f"{total_exec_time:.4f} detik",
-        exec_graph=f"{time_graph:.4f} detik",
-        exec_coloring=f"{time_coloring:.4f} detik",
-        graph_img=graph_img,
-        latency=f"{latency:.4f} detik",
-        throughput=f"{throughput:.2f} edge/detik"
-    )
+    algo, budget_ms = get_algo()
+    total_start = time.perf_counter()
+    G, chromatic_num, pewarnaan, time_graph, time_coloring, info = get_colored_graph(algo, budget_ms)
+    total_exec_time = time.perf_counter() - total_start
+    # Graf digambar di browser dari /graph.json; /graph.png untuk gambar statis
+    jumlah_konflik = G.number_of_conflicts()
+    slot_map = fetch_jadwal_info()
+
+    with span("template_render"):
+        return render_template("index.html",
+            slot_map=slot_map,
+            jumlah_simpul=G.number_of_nodes(),
+            jumlah_konflik=jumlah_konflik,
+            chromatic_number=chromatic_num,
+            kapasitas_slot=KAPASITAS_SLOT,
+            pewarnaan=pewarnaan,
+            nama=current_user.nama,
+            role=current_user.role,
+            exec_time=f"{total_exec_time:.4f} detik",
+            exec_graph=f"{time_graph:.4f} detik",
+            exec_coloring=f"{time_coloring:.4f} detik",
+            algo=algo,
+            algo_label=ALGO_LABEL,
+            budget_ms=budget_ms,
+            budget_pilihan=app.config["BUDGET_MS_PILIHAN"],
+            coloring_info=info,
+            job_id=request.args.get("job")
+        )
+
+@app.route("/graph.png")
+@login_required
+def graph_png():
+    algo, budget_ms = get_algo()
+    lod, kode = get_lod()
+    G, _, pewarnaan, _, _, _ = get_colored_graph(algo, budget_ms)
+    if kode is not None and kode not in G.index:
+        abort(404, f"Mata kuliah {kode} tidak ada di graf.")
+    title = graph_title(algo)
+    key = graph_hash(G, pewarnaan, title, lod, kode)
+    if key in request.if_none_match:
+        resp = Response(status=304)
+    else:
+        png = get_png(key, G, pewarnaan, title, lod, kode)
+        if png is None:
+            return Response("Gambar masih dirender.", status=503, headers={"Retry-After": "2"})
+        resp = Response(png, mimetype="image/png")
+    resp.set_etag(key)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+# JSON graf yang sudah pernah dikirim, kuncinya sama dengan ETag
+json_cache = TTLCache(maxsize=8, ttl=300)
+
+@app.route("/graph.json")
+@login_required
+def graph_json_export():
+    algo, budget_ms = get_algo()
+    G, _, pewarnaan, _, _, _ = get_colored_graph(algo, budget_ms)
+    key = graph_hash(G, pewarnaan, "json")
+    headers = {"ETag": f'"{key}"', "Cache-Control": "no-cache"}
+    if key in request.if_none_match:
+        return Response(status=304, headers=headers)
+    body = json_cache.get(key)
+    if body is not None:
+        return Response(body, mimetype="application/json", headers=headers)
+
+    with span("layout"):
+        pos = layout_graph(G)
+    rooms = fetch_course_rooms()
+
+    def stream():
+        bagian = []
+        for chunk in graph_json(G, pewarnaan, pos, rooms):
+            bagian.append(chunk)
+            yield chunk
+        json_cache.set(key, "".join(bagian))
+
+    return Response(stream(), mimetype="application/json", headers=headers)
 
 @app.route("/sinkron-pewarnaan", methods=["POST"])
 @login_required
@@ -188,35 +330,77 @@ def sinkron_pewarnaan():
         flash("Hanya admin yang diizinkan.")
         return redirect(url_for("jadwal"))
 
-    G, _ = build_graph()
-    _, pewarnaan, _ = welsh_powell_coloring(G)
+    algo, budget_ms = get_algo()
+    mode = request.values.get("mode", "inkremental")
+    # Satu sinkronisasi sekaligus; kiriman ganda memakai job yang sedang jalan
+    job, baru = submit_job("sinkron", jalankan_sinkron, algo, budget_ms, mode)
+    if baru:
+        flash(f"Sinkronisasi jadwal dimulai di latar belakang (job {job.id}).")
+    else:
+        flash(f"Sinkronisasi masih berjalan (job {job.id}), permintaan baru tidak dibuat.")
+    return redirect(url_for("jadwal", algo=algo, budget_ms=budget_ms, job=job.id))
+
+@app.route("/sinkron-pewarnaan/<job_id>")
+@login_required
+def status_sinkron(job_id):
+    job = get_job(job_id)
+    if job is None:
+        abort(404, "Job tidak ditemukan.")
+    return jsonify(job.to_dict())
 
-    with get_session() as session:
-        for kode, slot in pewarnaan.items():
-            hari, jam_mulai, jam_selesai = slot_to_hari_jam(slot)
-            session.run("MATCH (c:MataKuliah {kode:$kode})-[r:DIJADWALKAN]->() DELETE r", kode=kode)
-            session.run("""
-                MERGE (j:Jadwal {slot:$slot})
-                SET j.hari=$hari, j.jam_mulai=$jam_mulai, j.jam_selesai=$jam_selesai
-                WITH j
-                MATCH (c:MataKuliah {kode:$kode})
-                MERGE (c)-[:DIJADWALKAN]->(j)
-            """, kode=kode, slot=slot, hari=hari, jam_mulai=jam_mulai, jam_selesai=jam_selesai)
+def jalankan_sinkron(job, algo, budget_ms, mode):
+    # Dijalankan di thread job. inkremental: jadwal tersimpan hanya diperbaiki
+    # di sekitar MK yang bentroknya berubah sejak sinkron terakhir (plus MK
+    # yang belum terjadwal); penuh: jadwal diganti hasil pewarnaan baru.
+    # Keduanya hanya menulis selisih.
+    repo = get_repo()
+    # Penanda dibaca sebelum graf supaya perubahan sesudahnya tidak ikut terhapus
+    berubah = repo.changed_courses()
+    sebelumnya = {}
+    if mode == "inkremental":
+        job.update(stage="baca jadwal")
+        sebelumnya = repo.read_schedule()
+    if sebelumnya:
+        # Cukup grafnya; pewarnaan penuh tidak dihitung
+        job.update(stage="baca graf")
+        G, _ = build_graph()
+        job.update(stage="pewarnaan ulang")
+        periksa = set(berubah) | {kode for kode in G.nodes if kode not in sebelumnya}
+        with span("recolor"):
+            pewarnaan, info = recolor_incremental(G, sebelumnya, changed=periksa)
+        app.logger.info("Pewarnaan ulang inkremental: %d diperiksa, %d pindah, %d baru, %d tukar Kempe",
+                        len(periksa), info["dipindah"], info["baru"], info["kempe"])
+    else:
+        job.update(stage="pewarnaan")
+        G, _, pewarnaan, _, _, _ = get_colored_graph(algo, budget_ms)
+    # Slot di luar minggu kerja tidak punya hari/jam: jadwal lama dibiarkan
+    if jumlah_warna(pewarnaan) > KAPASITAS_SLOT:
+        raise ValueError(f"Pewarnaan butuh {jumlah_warna(pewarnaan)} slot, kapasitas hanya "
+                         f"{KAPASITAS_SLOT} ({len(HARI)} hari x {SESI_PER_HARI} sesi). Jadwal tidak diubah.")
+    job.update(stage="tulis")
+    with span("sync_write"):
+        hasil = repo.sync_schedule(pewarnaan, slot_to_hari_jam,
+                                   on_chunk=lambda ditulis: job.update(ditulis=ditulis))
+    repo.clear_changed(berubah)
+    app.logger.info("Sinkron: %d baru, %d pindah, %d dihapus, %d tetap, %.4f detik",
+                    hasil["tambah"], hasil["pindah"], hasil["hapus"], hasil["tetap"], hasil["detik"])
 
-    flash("Jadwal berhasil disinkronkan dengan hasil pewarnaan.")
-    return redirect(url_for("jadwal"))
+    ringkas = f"{hasil['tambah']} baru, {hasil['pindah']} pindah slot, {hasil['hapus']} dihapus, {hasil['tetap']} tetap; {hasil['detik']:.4f} detik"
+    if sebelumnya:
+        hasil["pesan"] = f"Jadwal diperbaiki secara inkremental ({ringkas})."
+    else:
+        hasil["pesan"] = f"Jadwal berhasil disinkronkan dengan hasil pewarnaan {ALGO_LABEL[algo]} ({ringkas})."
+    return hasil
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
     error = None
     if request.method == "POST":
         uid = request.form["id"]
-        with get_session() as s:
-            r = s.run("MATCH (u:User {id:$id}) RETURN u.id AS id, u.nama AS nama, u.role AS role", id=uid).single()
-        if not r:
+        user = fetch_user(uid)
+        if not user:
             error = "User ID tidak ditemukan."
         else:
-            user = User(r["id"], r["nama"], r["role"])
             login_user(user)
             return redirect(url_for("jadwal"))
     return render_template("login.html", error=error)
@@ -224,18 +408,66 @@ def login():
 @app.route("/logout")
 @login_required
 def logout():
+    # Login berikutnya membaca ulang data user dari penyimpanan
+    invalidate_user(current_user.id)
     logout_user()
     return redirect(url_for("login"))
 
+@app.before_request
+def mulai_ukur():
+    g.mulai = time.perf_counter()
+
+@app.after_request
+def catat_durasi(resp):
+    if "mulai" in g:
+        request_seconds.observe(time.perf_counter() - g.mulai,
+                                endpoint=request.endpoint or "-", status=resp.status_code)
+    return resp
+
+@register_collector
+def metrik_cache():
+    caches = {"user": user_cache, "graph": graph_cache, "graph_json": json_cache}
+    for jenis in ("hits", "misses"):
+        yield f"# TYPE grafcoloring_cache_{jenis}_total counter"
+        for nama, cache in caches.items():
+            yield f'grafcoloring_cache_{jenis}_total{{cache="{nama}"}} {getattr(cache, jenis)}'
+    yield "# TYPE grafcoloring_singleflight_shared_total counter"
+    yield f"grafcoloring_singleflight_shared_total {inflight.shared}"
+
+def metrics_diizinkan():
+    token = app.config["METRICS_TOKEN"]
+    if token:
+        diberikan = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if hmac.compare_digest(diberikan.encode(), token.encode()):
+            return True
+    return request.remote_addr in app.config["METRICS_IZIN"]
+
+@app.route("/metrics")
+def metrics():
+    # Format teks Prometheus; histogram per tahap untuk p95/p99
+    if not metrics_diizinkan():
+        abort(403)
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/admin/cache")
+@login_required
+def cache_stats():
+    if current_user.role != "Admin":
+        abort(403)
+    return jsonify({
+        "user": user_cache.stats(),
+        "graph": graph_cache.stats(),
+        "graph_json": json_cache.stats(),
+        "singleflight_shared": inflight.shared,
+    })
+
 @app.route("/admin/mk")
 @login_required
 def list_mk():
     if current_user.role != "Admin":
         flash("Hanya admin yang diizinkan.")
         return redirect(url_for("jadwal"))
-    with get_session() as s:
-        rows = s.run("MATCH (c:MataKuliah) RETURN c.kode AS kode, c.nama AS nama, c.ruangan AS ruangan")
-        mk_list = [dict(kode=r["kode"], nama=r["nama"], ruangan=r["ruangan"]) for r in rows]
+    mk_list = get_repo().list_courses()
     return render_template("list_mk.html", mk_list=mk_list)
 
 @app.route("/admin/mk/add", methods=["GET", "POST"])
@@ -246,8 +478,8 @@ def add_mk():
         return redirect(url_for("jadwal"))
     if request.method == "POST":
         k, n, r = request.form["kode"], request.form["nama"], request.form["ruangan"]
-        with get_session() as s:
-            s.run("CREATE (:MataKuliah {kode:$k, nama:$n, ruangan:$r})", k=k, n=n, r=r)
+        if not get_repo().add_course(k, n, r):
+            flash(f"Kode MK {k} sudah ada.")
         return redirect(url_for("list_mk"))
     return render_template("form_mk.html", mode="Add", mk=None)
 
@@ -257,17 +489,15 @@ def edit_mk(kode):
     if current_user.role != "Admin":
         flash("Hanya admin yang diizinkan.")
         return redirect(url_for("jadwal"))
-    with get_session() as s:
-        ex = s.run("MATCH (c:MataKuliah {kode:$k}) RETURN c.kode AS kode, c.nama AS nama, c.ruangan AS ruangan", k=kode).single()
+    ex = get_repo().get_course(kode)
     if not ex:
         flash("Mata kuliah tidak ditemukan.")
         return redirect(url_for("list_mk"))
     if request.method == "POST":
         n, r = request.form["nama"], request.form["ruangan"]
-        with get_session() as s:
-            s.run("MATCH (c:MataKuliah {kode:$k}) SET c.nama=$n, c.ruangan=$r", k=kode, n=n, r=r)
+        get_repo().update_course(kode, n, r)
         return redirect(url_for("list_mk"))
-    return render_template("form_mk.html", mode="Edit", mk=dict(kode=ex["kode"], nama=ex["nama"], ruangan=ex["ruangan"]))
+    return render_template("form_mk.html", mode="Edit", mk=ex)
 
 @app.route("/admin/mk/delete/<kode>", methods=["POST"])
 @login_required
@@ -275,9 +505,9 @@ def delete_mk(kode):
     if current_user.role != "Admin":
         flash("Hanya admin yang diizinkan.")
         return redirect(url_for("jadwal"))
-    with get_session() as s:
-        s.run("MATCH (c:MataKuliah {kode:$k}) DETACH DELETE c", k=kode)
+    get_repo().delete_course(kode)
     return redirect(url_for("list_mk"))
 
 if __name__ == "__main__":
+    init_schema()
     app.run(debug=True)
@@ -0,0 +1,192 @@
+# === Benchmark pewarnaan graf pada graf sintetis ===
+# Jalankan: python benchmark.py                  (Welsh-Powell lama vs baru)
+#           python benchmark.py suite --preset sedang --seed 42 --output hasil.json
+# Suite memakai universitas sintetis (sintetis.py) dan menulis JSON yang bisa
+# dibandingkan antar commit: slot, waktu, memori puncak, edge/detik per tahap.
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+from coloring import ALGORITMA, jumlah_warna, welsh_powell
+from compact_graph import CompactGraph
+from portfolio import WORKERS
+from sintetis import PRESET, generate_university, room_cliques
+from sparse_conflicts import conflicts_from_incidence, sparse
+from storage import MemoryRepository
+
+
+# Implementasi Welsh-Powell lama (O(k.V.Δ)), disimpan hanya sebagai pembanding
+def welsh_powell_lama(G):
+    nodes_sorted = sorted(G.nodes(), key=lambda x: G.degree(x), reverse=True)
+    coloring = {}
+    current_color = 0
+    for node in nodes_sorted:
+        if node in coloring:
+            continue
+        coloring[node] = current_color
+        for other in nodes_sorted:
+            if other not in coloring and all(
+                neighbor not in coloring or coloring[neighbor] != current_color
+                for neighbor in G.neighbors(other)
+            ):
+                coloring[other] = current_color
+        current_color += 1
+    return coloring
+
+
+def ukur(fn, G):
+    # GC dimatikan selama pengukuran, seperti timeit
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        hasil = fn(G)
+        return hasil, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def bench_welsh_powell(ukuran=(5000, 10000, 20000, 50000), rata_derajat=40, seed=42):
+    for n in ukuran:
+        G = nx.gnm_random_graph(n, n * rata_derajat // 2, seed=seed)
+        G = nx.relabel_nodes(G, {i: f"MK{i:05d}" for i in G})
+        lama, t_lama = ukur(welsh_powell_lama, G)
+        baru, t_baru = ukur(welsh_powell, G)
+        assert lama == baru and list(lama) == list(baru)
+        print(f"V={n:6d} E={G.number_of_edges():7d} slot={max(baru.values()) + 1:3d}  "
+              f"lama={t_lama:.4f}s  baru={t_baru:.4f}s  speedup={t_lama / t_baru:.1f}x")
+
+
+def ukur_memori(fn, *args):
+    # Pass terpisah dengan tracemalloc (memperlambat, jadi tidak dipakai untuk waktu)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(preset="kecil", seed=42, algoritma=tuple(ALGORITMA), render=True, pipeline=True,
+                budget_ms=None, tabu_ms=None):
+    # budget_ms / tabu_ms: None = nilai default di app.config. Keduanya batas
+    # waktu nyata, jadi ikut dicatat di laporan bersama jumlah core/worker.
+    data = generate_university(seed=seed, **PRESET[preset])
+    hasil = []
+
+    def catat(tahap, fn, *args):
+        keluaran, detik = ukur(lambda _: fn(*args), None)
+        baris = {"tahap": tahap, "detik": round(detik, 6),
+                 "peak_mb": round(ukur_memori(fn, *args) / 2 ** 20, 3)}
+        hasil.append(baris)
+        return keluaran, baris
+
+    def laju(baris, jumlah_edge):
+        baris["edge_per_detik"] = round(jumlah_edge / baris["detik"], 1) if baris["detik"] > 0 else None
+
+    konflik, baris = catat("konflik", conflicts_from_incidence, data["mengambil"], data["mengajar"])
+    edges = [(mk1, mk2) for mk1, mk2, _, _ in konflik]
+    laju(baris, len(edges))
+    kodes = [kode for kode, _, _ in data["courses"]]
+    cliques = room_cliques(data["courses"])
+
+    # Jalur yang dipakai aplikasi dengan GRAFCOLORING_STORAGE=memory
+    # (termasuk memuat data ke repository)
+    _, baris = catat("repo_konflik", lambda: MemoryRepository(data).conflicts())
+    laju(baris, len(edges))
+
+    G, baris = catat("bangun_graf", CompactGraph.from_edges, edges, kodes, cliques)
+    jumlah_konflik = G.number_of_conflicts()
+    laju(baris, jumlah_konflik)
+    for nama in algoritma:
+        coloring, baris = catat(nama, ALGORITMA[nama], G)
+        laju(baris, jumlah_konflik)
+        baris["slot"] = jumlah_warna(coloring)
+
+    if pipeline:
+        # app.color_graph: komponen, reduksi (sesuai REDUKSI_ALGO) dan tabu search
+        from app import app, color_graph
+        budget_ms = budget_ms if budget_ms is not None else app.config["DEFAULT_BUDGET_MS"]
+        tabu_lama = app.config["TABU_MS"]
+        tabu_ms = app.config["TABU_MS"] = tabu_ms if tabu_ms is not None else tabu_lama
+        try:
+            for nama in algoritma:
+                (slot, _, _, info), baris = catat(f"pipeline_{nama}", color_graph, G, nama, budget_ms)
+                laju(baris, jumlah_konflik)
+                baris["slot"] = slot
+                if "tabu" in info:
+                    baris["tabu"] = {"awal": info["tabu"]["awal"], "lower": info["tabu"]["lower"]}
+        finally:
+            app.config["TABU_MS"] = tabu_lama
+
+    if render:
+        from visual import render_png
+        coloring = ALGORITMA["dsatur"](G)
+        catat("render_png", render_png, G, coloring, "benchmark", "auto", None, False)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "scipy": sparse is not None,
+        "cpu": os.cpu_count(),
+        "workers": WORKERS,
+        "budget_ms": budget_ms if pipeline else None,
+        "tabu_ms": tabu_ms if pipeline else None,
+        "preset": preset,
+        "seed": seed,
+        "ukuran": {
+            "mahasiswa": PRESET[preset]["mahasiswa"],
+            "mk": len(kodes),
+            "konflik": jumlah_konflik,
+            "edge": G.number_of_edges(),
+            "klik_ruangan": len(cliques),
+            "mengambil": len(data["mengambil"]),
+        },
+        "hasil": hasil,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pewarnaan graf")
+    sub = parser.add_subparsers(dest="perintah")
+    sub.add_parser("wp", help="Welsh-Powell lama vs baru (default)")
+    suite = sub.add_parser("suite", help="Suite universitas sintetis, keluaran JSON")
+    suite.add_argument("--preset", choices=sorted(PRESET), default="kecil")
+    suite.add_argument("--seed", type=int, default=42)
+    suite.add_argument("--algo", action="append", choices=sorted(ALGORITMA),
+                       help="Algoritma yang diukur (boleh berulang; default semua)")
+    suite.add_argument("--tanpa-render", action="store_true")
+    suite.add_argument("--tanpa-pipeline", action="store_true", help="Lewati app.color_graph")
+    suite.add_argument("--budget-ms", type=int, help="Budget portfolio (default DEFAULT_BUDGET_MS app)")
+    suite.add_argument("--tabu-ms", type=int, help="Batas tabu search (default TABU_MS app)")
+    suite.add_argument("--output", help="File JSON (default stdout)")
+    args = parser.parse_args()
+
+    if args.perintah == "suite":
+        laporan = bench_suite(args.preset, args.seed, tuple(args.algo or ALGORITMA), not args.tanpa_render,
+                              not args.tanpa_pipeline, args.budget_ms, args.tabu_ms)
+        teks = json.dumps(laporan, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(teks + "\n")
+        else:
+            sys.stdout.write(teks + "\n")
+    else:
+        bench_welsh_powell()
@@ -1,11 +1,16 @@
 from neo4j import GraphDatabase
-import networkx as nx
+from coloring import dsatur
+from compact_graph import CompactGraph
+from exact import exact_chromatic
 
 # Koneksi ke Neo4j
 uri = "bolt://localhost:7687"
 username = "neo4j"
 password = "password"
 
+# Batas waktu solver eksak (detik)
+batas_waktu = 10.0
+
 driver = GraphDatabase.driver(uri, auth=(username, password))
 
 # Query ambil konflik antar MataKuliah
@@ -16,40 +21,14 @@ RETURN DISTINCT c1.kode AS dari, c2.kode AS ke
 
 # Bangun graf dari hasil query
 def build_graph():
-    G = nx.Graph()
     with driver.session() as session:
         result = session.run(CYTHER_QUERY)
-        for record in result:
-            G.add_edge(record["dari"], record["ke"])
-    return G
+        edges = [(record["dari"], record["ke"]) for record in result]
+    return CompactGraph.from_edges(edges)
 
-# DSatur Coloring Algorithm
+# DSatur Coloring Algorithm (mesin di coloring.py)
 def dsatur_coloring(G):
-    coloring = {}
-    uncolored = set(G.nodes)
-    degrees = dict(G.degree)
-
-    while uncolored:
-        # Hitung saturasi untuk simpul tak berwarna
-        saturations = {}
-        for node in uncolored:
-            neighbor_colors = {coloring[n] for n in G.neighbors(node) if n in coloring}
-            saturations[node] = len(neighbor_colors)
-
-        # Pilih node dengan saturasi tertinggi, kalau seri ambil derajat tertinggi
-        max_sat = max(saturations.values())
-        candidates = [n for n in uncolored if saturations[n] == max_sat]
-        next_node = max(candidates, key=lambda n: degrees[n])
-
-        # Tentukan warna minimum yang belum dipakai tetangga
-        neighbor_colors = {coloring[n] for n in G.neighbors(next_node) if n in coloring}
-        color = 0
-        while color in neighbor_colors:
-            color += 1
-
-        coloring[next_node] = color
-        uncolored.remove(next_node)
-
+    coloring = dsatur(G)
     num_colors = max(coloring.values()) + 1
     return num_colors, coloring
 
@@ -62,8 +41,18 @@ print(f"Jumlah konflik (edge): {G.number_of_edges()}")
 if G.number_of_nodes() == 0:
     print("⚠️ Graf kosong! Pastikan data dan relasi 'BERTABRAKAN_DENGAN' sudah dimasukkan.")
 else:
-    chromatic, coloring = dsatur_coloring(G)
-    print(f"Chromatic Number (jumlah slot minimal): {chromatic}")
+    heuristik, _ = dsatur_coloring(G)
+    print(f"Jumlah slot heuristik: {heuristik}")
+
+    hasil = exact_chromatic(G, time_limit=batas_waktu)
+    coloring = hasil["coloring"]
+    print(f"Batas bawah (klik): {hasil['lower']}, batas atas: {hasil['upper']} "
+          f"({hasil['node_bnb']} node B&B, {hasil['detik']:.2f} detik)")
+    if hasil["optimal"]:
+        print(f"Chromatic Number (jumlah slot minimal): {hasil['upper']} (optimal terbukti)")
+    else:
+        print(f"Chromatic Number (jumlah slot minimal): antara {hasil['lower']} dan {hasil['upper']} "
+              f"(batas waktu {batas_waktu} detik tercapai, belum terbukti optimal)")
     print("Pewarnaan (slot tiap mata kuliah):")
     for node, color in coloring.items():
         print(f"  {node} => Slot {color + 1}")
@@ -1,11 +1,16 @@
 from neo4j import GraphDatabase
-import networkx as nx
+from coloring import greedy
+from compact_graph import CompactGraph
+from exact import exact_chromatic
 
 # Koneksi ke Neo4j
 uri = "bolt://localhost:7687"  # atau sesuaikan dengan server-mu
 username = "neo4j"
 password = "password"
 
+# Batas waktu solver eksak (detik)
+batas_waktu = 10.0
+
 driver = GraphDatabase.driver(uri, auth=(username, password))
 
 # Query ambil konflik antar MataKuliah
@@ -16,16 +21,14 @@ RETURN DISTINCT c1.kode AS dari, c2.kode AS ke
 
 # Bangun graf dari hasil query
 def build_graph():
-    G = nx.Graph()
     with driver.session() as session:
         result = session.run(CYTHER_QUERY)
-        for record in result:
-            G.add_edge(record["dari"], record["ke"])
-    return G
+        edges = [(record["dari"], record["ke"]) for record in result]
+    return CompactGraph.from_edges(edges)
 
 # Hitung chromatic number (greedy coloring)
 def greedy_chromatic_number(G):
-    coloring = nx.coloring.greedy_color(G, strategy="largest_first")
+    coloring = greedy(G, order="largest_first")
     num_colors = max(coloring.values()) + 1  # warna dimulai dari 0
     return num_colors, coloring
 
@@ -38,8 +41,18 @@ print(f"Jumlah konflik (edge): {G.number_of_edges()}")
 if G.number_of_nodes() == 0:
     print("⚠️ Graf kosong! Pastikan data dan relasi 'BERTABRAKAN_DENGAN' sudah dimasukkan.")
 else:
-    chromatic, coloring = greedy_chromatic_number(G)
-    print(f"Chromatic Number (jumlah slot minimal): {chromatic}")
+    heuristik, _ = greedy_chromatic_number(G)
+    print(f"Jumlah slot heuristik: {heuristik}")
+
+    hasil = exact_chromatic(G, time_limit=batas_waktu)
+    coloring = hasil["coloring"]
+    print(f"Batas bawah (klik): {hasil['lower']}, batas atas: {hasil['upper']} "
+          f"({hasil['node_bnb']} node B&B, {hasil['detik']:.2f} detik)")
+    if hasil["optimal"]:
+        print(f"Chromatic Number (jumlah slot minimal): {hasil['upper']} (optimal terbukti)")
+    else:
+        print(f"Chromatic Number (jumlah slot minimal): antara {hasil['lower']} dan {hasil['upper']} "
+              f"(batas waktu {batas_waktu} detik tercapai, belum terbukti optimal)")
     print("Pewarnaan (slot tiap mata kuliah):")
     for node, color in coloring.items():
         print(f"  {node} => Slot {color + 1}")
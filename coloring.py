@@ -0,0 +1,183 @@
+# === Mesin pewarnaan graf ===
+# Dipakai bersama oleh aplikasi Flask dan skrip chromatic-*.py.
+# Semua fungsi menerima CompactGraph (atau nx.Graph, dikonversi di awal) dan
+# bekerja dengan id integer; hasil dikembalikan sebagai dict kode -> warna.
+# Klik ruangan (G.cliques) diperlakukan sebagai edge antar semua anggotanya.
+import heapq
+import random
+import time
+from itertools import chain
+
+from compact_graph import as_compact
+
+
+def _warna_terkecil(mask):
+    # Bit 0 terendah pada mask = warna terkecil yang belum dipakai tetangga
+    return (~mask & (mask + 1)).bit_length() - 1
+
+
+# Seberapa sering deadline dicek (jumlah simpul di antara dua pengecekan)
+CEK_DEADLINE = 1024
+
+
+def dsatur(G, deadline=None):
+    # DSatur dengan heap prioritas (saturasi, derajat) dan bitset warna tetangga
+    # per simpul yang diperbarui inkremental: O((V+E) log V).
+    # Seri diputus dengan urutan simpul di G, sama seperti max() pada versi lama.
+    # deadline (time.time()): None dikembalikan bila terlewati sebelum selesai.
+    g = as_compact(G)
+    adj = g.adjacency()
+    cliques = g.cliques
+    node_q = g.node_cliques()
+    n = len(adj)
+    color = [-1] * n
+    mask = [0] * n
+    sat = [0] * n
+    deg = g.degrees()
+
+    heap = [(0, -deg[v], v) for v in range(n)]
+    heapq.heapify(heap)
+    diwarnai = 0
+    while heap:
+        s, _, v = heapq.heappop(heap)
+        # Entri usang (sudah diwarnai atau saturasinya sudah naik) dilewati
+        if color[v] >= 0 or -s != sat[v]:
+            continue
+        diwarnai += 1
+        if deadline is not None and diwarnai % CEK_DEADLINE == 0 and time.time() > deadline:
+            return None
+        c = _warna_terkecil(mask[v])
+        color[v] = c
+        bit = 1 << c
+        tetangga = chain(adj[v], *(cliques[q] for q in node_q[v])) if node_q[v] else adj[v]
+        for u in tetangga:
+            if color[u] < 0 and not mask[u] & bit:
+                mask[u] |= bit
+                sat[u] += 1
+                heapq.heappush(heap, (-sat[u], -deg[u], u))
+
+    return g.to_mapping(color)
+
+
+def welsh_powell(G, deadline=None):
+    # Welsh-Powell: simpul diurutkan derajat menurun (stabil), lalu tiap kelas
+    # warna dibangun dalam satu lintasan atas simpul yang tersisa. forbidden[v]
+    # menyimpan warna terakhir yang dipakai tetangga v, jadi cek "boleh pakai
+    # warna c" cukup satu perbandingan. Hasilnya identik dengan versi lama.
+    # Untuk klik cukup dicatat warna terakhir yang dipakai di klik itu.
+    # deadline seperti dsatur.
+    g = as_compact(G)
+    adj = g.adjacency()
+    node_q = g.node_cliques()
+    deg = g.degrees()
+    n = len(adj)
+    sisa = sorted(range(n), key=lambda v: deg[v], reverse=True)
+    forbidden = [-1] * n
+    clique_last = [-1] * len(g.cliques)
+    coloring = {}
+    c = 0
+    while sisa:
+        tertunda = []
+        for i, v in enumerate(sisa):
+            if deadline is not None and i % CEK_DEADLINE == 0 and time.time() > deadline:
+                return None
+            if forbidden[v] == c or (node_q[v] and any(clique_last[q] == c for q in node_q[v])):
+                tertunda.append(v)
+                continue
+            coloring[g.nodes[v]] = c
+            for u in adj[v]:
+                forbidden[u] = c
+            for q in node_q[v]:
+                clique_last[q] = c
+        sisa = tertunda
+        c += 1
+    return coloring
+
+
+def _smallest_last(g):
+    # Urutan degenerasi: berulang kali buang simpul berderajat terkecil
+    # (bucket queue), lalu warnai dengan urutan terbalik
+    adj = g.adjacency()
+    cliques = g.cliques
+    node_q = g.node_cliques()
+    deg = g.degrees()
+    n = len(adj)
+    buckets = [set() for _ in range(max(deg, default=0) + 1)]
+    for v in range(n):
+        buckets[deg[v]].add(v)
+    removed = [False] * n
+    urutan = []
+    d = 0
+    for _ in range(n):
+        while not buckets[d]:
+            d += 1
+        v = buckets[d].pop()
+        removed[v] = True
+        urutan.append(v)
+        for u in chain(adj[v], *(cliques[q] for q in node_q[v])):
+            if not removed[u]:
+                buckets[deg[u]].discard(u)
+                deg[u] -= 1
+                buckets[deg[u]].add(u)
+                d = min(d, deg[u])
+    urutan.reverse()
+    return urutan
+
+
+def greedy_order(g, order, seed=None):
+    n = len(g)
+    if order == "natural":
+        return range(n)
+    if order == "largest_first":
+        deg = g.degrees()
+        return sorted(range(n), key=lambda v: deg[v], reverse=True)
+    if order == "smallest_last":
+        return _smallest_last(g)
+    if order == "random":
+        urutan = list(range(n))
+        random.Random(seed).shuffle(urutan)
+        return urutan
+    raise ValueError(f"Urutan greedy tidak dikenal: {order}")
+
+
+def greedy_colors(g, urutan, adj=None):
+    # First-fit: tiap simpul mendapat warna terkecil yang tidak dipakai tetangga
+    # atau anggota lain di kliknya
+    if adj is None:
+        adj = g.adjacency()
+    node_q = g.node_cliques()
+    clique_mask = [0] * len(g.cliques)
+    color = [-1] * len(adj)
+    for v in urutan:
+        mask = 0
+        for u in adj[v]:
+            if color[u] >= 0:
+                mask |= 1 << color[u]
+        for q in node_q[v]:
+            mask |= clique_mask[q]
+        c = color[v] = _warna_terkecil(mask)
+        for q in node_q[v]:
+            clique_mask[q] |= 1 << c
+    return color
+
+
+def greedy(G, order="natural", seed=None):
+    # order="natural" = urutan simpul di graf (greedy_coloring),
+    # order="largest_first" = sama dengan nx.coloring.greedy_color,
+    # order="smallest_last" / "random" dipakai oleh portfolio
+    g = as_compact(G)
+    urutan = greedy_order(g, order, seed)
+    color = greedy_colors(g, urutan)
+    return {g.nodes[v]: color[v] for v in urutan}
+
+
+def jumlah_warna(coloring):
+    return max(coloring.values()) + 1 if coloring else 0
+
+
+# Algoritma tunggal yang bisa dipilih lewat ?algo=
+ALGORITMA = {
+    "welsh_powell": welsh_powell,
+    "greedy": greedy,
+    "dsatur": dsatur,
+}
@@ -0,0 +1,142 @@
+# === Representasi graf konflik yang ringkas (CSR) ===
+# Kode mata kuliah di-intern menjadi id integer 0..V-1. Tetangga simpul v ada di
+# indices[indptr[v]:indptr[v+1]]. Urutan simpul dan tetangga mengikuti urutan
+# kemunculan edge, sama seperti nx.Graph.add_edges_from, sehingga hasil
+# pewarnaan tidak berubah dibanding graf networkx yang setara.
+#
+# Konflik ruangan disimpan sebagai klik (cliques): daftar id simpul yang saling
+# bentrok semua, tanpa mematerialisasi N² edge untuk ruangan besar. Mesin di
+# coloring.py memperlakukan anggota klik yang sama sebagai bertetangga.
+from array import array
+
+
+class CompactGraph:
+    __slots__ = ("nodes", "index", "indptr", "indices", "cliques")
+
+    def __init__(self, nodes, indptr, indices, cliques=()):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.cliques = [array("i", q) for q in cliques]
+
+    @classmethod
+    def _from_adj(cls, nodes, adj, cliques=()):
+        indptr = array("l", [0])
+        indices = array("i")
+        for nbrs in adj:
+            indices.extend(nbrs)
+            indptr.append(len(indices))
+        return cls(nodes, indptr, indices, cliques)
+
+    @classmethod
+    def from_edges(cls, edges, nodes=(), cliques=()):
+        index = {}
+        adj = []
+        cliques = [list(dict.fromkeys(members)) for members in cliques]
+        cliques = [members for members in cliques if len(members) > 1]
+        # Pasangan yang sudah bentrok lewat klik tidak disimpan lagi sebagai edge,
+        # supaya derajat dan jumlah konflik sama dengan graf yang dimaterialisasi
+        klik_of = {}
+        for i, members in enumerate(cliques):
+            for node in members:
+                klik_of.setdefault(node, set()).add(i)
+
+        def id_of(node):
+            i = index.get(node)
+            if i is None:
+                i = index[node] = len(adj)
+                adj.append({})
+            return i
+
+        for node in nodes:
+            id_of(node)
+        for a, b in edges:
+            u, v = id_of(a), id_of(b)
+            if u != v and not klik_of.get(a, set()) & klik_of.get(b, set()):
+                adj[u][v] = None
+                adj[v][u] = None
+        klik = [[id_of(node) for node in members] for members in cliques]
+        return cls._from_adj(list(index), adj, klik)
+
+    @classmethod
+    def from_networkx(cls, G):
+        nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        adj = [[index[n] for n in nbrs] for _, nbrs in G.adjacency()]
+        return cls._from_adj(nodes, adj)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def number_of_clique_pairs(self):
+        return sum(len(q) * (len(q) - 1) // 2 for q in self.cliques)
+
+    def number_of_conflicts(self):
+        # Edge tersimpan + pasangan dalam klik ruangan
+        return self.number_of_edges() + self.number_of_clique_pairs()
+
+    def degrees(self):
+        # Derajat di graf konflik lengkap, termasuk sesama anggota klik
+        indptr = self.indptr
+        deg = [indptr[v + 1] - indptr[v] for v in range(len(self.nodes))]
+        for q in self.cliques:
+            for v in q:
+                deg[v] += len(q) - 1
+        return deg
+
+    def node_cliques(self):
+        # Id klik yang memuat tiap simpul (tuple kosong untuk kebanyakan simpul)
+        per_node = [()] * len(self.nodes)
+        for i, q in enumerate(self.cliques):
+            for v in q:
+                per_node[v] = per_node[v] + (i,)
+        return per_node
+
+    def neighbors(self, v):
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def adjacency(self):
+        # List tetangga per simpul, untuk loop panas yang butuh akses acak berulang
+        indptr, indices = self.indptr, self.indices
+        return [indices[indptr[v]:indptr[v + 1]] for v in range(len(self.nodes))]
+
+    def expanded_adjacency(self):
+        # Tetangga per simpul dengan klik diekspansi jadi edge biasa (tanpa duplikat).
+        # Untuk algoritma yang butuh tabel per tetangga (solver eksak, tabu search).
+        adj = [set(nbrs) for nbrs in self.adjacency()]
+        for q in self.cliques:
+            for v in q:
+                adj[v].update(q)
+                adj[v].discard(v)
+        return [sorted(a) for a in adj]
+
+    def subgraph(self, ids):
+        # Subgraf terinduksi dari id simpul `ids` (urutan dipertahankan)
+        lokal = {v: i for i, v in enumerate(ids)}
+        adj = [[lokal[u] for u in self.neighbors(v) if u in lokal] for v in ids]
+        klik = [[lokal[v] for v in q if v in lokal] for q in self.cliques]
+        return CompactGraph._from_adj([self.nodes[v] for v in ids], adj, [q for q in klik if len(q) > 1])
+
+    def edges(self):
+        indptr, indices = self.indptr, self.indices
+        for u in range(len(self.nodes)):
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                if u < v:
+                    yield u, v
+
+    def to_mapping(self, colors):
+        # Kembali ke dict kode -> slot, hanya di batas API
+        return {self.nodes[v]: c for v, c in enumerate(colors)}
+
+
+def as_compact(G):
+    if isinstance(G, CompactGraph):
+        return G
+    return CompactGraph.from_networkx(G)
@@ -0,0 +1,220 @@
+# === Pemeliharaan relasi bentrok antar MataKuliah ===
+# Relasi BERTABRAKAN_* disimpan permanen di Neo4j dan hanya diperbarui untuk
+# mata kuliah yang berubah (tambah/edit MK, perubahan MENGAMBIL/MENGAJAR).
+# Halaman jadwal cukup membaca edge yang sudah ada.
+#
+# Bentrok ruangan tidak lagi disimpan sebagai edge: semua MK di ruangan yang sama
+# membentuk klik, jadi cukup dikelompokkan per ruangan saat dibaca
+# (read_room_cliques). Edge BERTABRAKAN_RUANGAN lama ikut dihapus saat refresh.
+
+JENIS_BENTROK = ["BERTABRAKAN_MAHASISWA", "BERTABRAKAN_DOSEN", "BERTABRAKAN_RUANGAN"]
+JENIS_TERSIMPAN = ["BERTABRAKAN_MAHASISWA", "BERTABRAKAN_DOSEN"]
+
+# Node penanda: dibuat setelah rebuild penuh pertama kali, sekaligus menyimpan
+# versi data (naik setiap MK atau relasi MENGAMBIL/MENGAJAR berubah)
+META_NAMA = "grafcoloring"
+
+# Teks query disimpan sebagai konstanta supaya schema.py bisa mem-PROFILE
+# query yang sama persis dengan yang dijalankan aplikasi
+NAIKKAN_VERSI = """
+    MERGE (m:Meta {nama:$nama})
+    SET m.versi = coalesce(m.versi, 0) + 1
+"""
+
+HAPUS_BENTROK = """
+    MATCH (c:MataKuliah)-[r:BERTABRAKAN_MAHASISWA|BERTABRAKAN_DOSEN|BERTABRAKAN_RUANGAN]-(:MataKuliah)
+    WHERE c.kode IN $kodes
+    WITH DISTINCT r
+    DELETE r
+"""
+
+# Arah edge selalu dari kode terkecil ke kode terbesar, sama seperti rebuild penuh
+HITUNG_BENTROK_MAHASISWA = """
+    MATCH (m:User {role:'Mahasiswa'})-[:MENGAMBIL]->(c1:MataKuliah)
+    WHERE c1.kode IN $kodes
+    MATCH (m)-[:MENGAMBIL]->(c2:MataKuliah)
+    WHERE c1 <> c2
+    WITH DISTINCT CASE WHEN c1.kode < c2.kode THEN c1 ELSE c2 END AS a,
+                  CASE WHEN c1.kode < c2.kode THEN c2 ELSE c1 END AS b
+    MERGE (a)-[:BERTABRAKAN_MAHASISWA]->(b)
+"""
+
+HITUNG_BENTROK_DOSEN = """
+    MATCH (d:User {role:'Dosen'})-[:MENGAJAR]->(c1:MataKuliah)
+    WHERE c1.kode IN $kodes
+    MATCH (d)-[:MENGAJAR]->(c2:MataKuliah)
+    WHERE c1 <> c2
+    WITH DISTINCT CASE WHEN c1.kode < c2.kode THEN c1 ELSE c2 END AS a,
+                  CASE WHEN c1.kode < c2.kode THEN c2 ELSE c1 END AS b
+    MERGE (a)-[:BERTABRAKAN_DOSEN]->(b)
+"""
+
+REBUILD_HAPUS = """
+    MATCH (:MataKuliah)-[r]->(:MataKuliah)
+    WHERE type(r) IN $jenis
+    DELETE r
+"""
+
+REBUILD_MAHASISWA = """
+    MATCH (m:User {role:'Mahasiswa'})-[:MENGAMBIL]->(c1:MataKuliah),
+          (m)-[:MENGAMBIL]->(c2:MataKuliah)
+    WHERE c1 <> c2 AND c1.kode < c2.kode
+    MERGE (c1)-[:BERTABRAKAN_MAHASISWA]->(c2)
+"""
+
+REBUILD_DOSEN = """
+    MATCH (d:User {role:'Dosen'})-[:MENGAJAR]->(c1:MataKuliah),
+          (d)-[:MENGAJAR]->(c2:MataKuliah)
+    WHERE c1 <> c2 AND c1.kode < c2.kode
+    MERGE (c1)-[:BERTABRAKAN_DOSEN]->(c2)
+"""
+
+# Penanda MK yang bentroknya berubah sejak sinkronisasi jadwal terakhir:
+# c.berubah = versi data saat berubah. Pewarnaan ulang inkremental hanya
+# memeriksa MK ini; penanda dihapus setelah sinkron bila versinya masih sama.
+TANDAI_BERUBAH = """
+    MATCH (m:Meta {nama:$nama})
+    UNWIND $kodes AS kode
+    MATCH (c:MataKuliah {kode:kode})
+    SET c.berubah = m.versi
+"""
+
+TANDAI_SEMUA = """
+    MATCH (m:Meta {nama:$nama})
+    MATCH (c:MataKuliah)
+    SET c.berubah = m.versi
+"""
+
+BACA_BERUBAH = "MATCH (c:MataKuliah) WHERE c.berubah IS NOT NULL RETURN c.kode AS kode, c.berubah AS versi"
+
+HAPUS_TANDA = """
+    UNWIND $rows AS row
+    MATCH (c:MataKuliah {kode:row.kode})
+    WHERE c.berubah = row.versi
+    REMOVE c.berubah
+"""
+
+BACA_VERSI = "MATCH (m:Meta {nama:$nama}) RETURN m.konflik_siap AS siap, m.versi AS versi"
+
+BACA_BENTROK = """
+    MATCH (c1:MataKuliah)-[r]->(c2:MataKuliah)
+    WHERE type(r) IN $jenis
+    RETURN DISTINCT c1.kode AS mk1, c2.kode AS mk2
+"""
+
+BACA_KODE_MK = "MATCH (c:MataKuliah) RETURN c.kode AS kode ORDER BY kode"
+
+BACA_RUANGAN_MK = "MATCH (c:MataKuliah) RETURN c.kode AS kode, c.ruangan AS ruangan"
+
+BACA_KLIK_RUANGAN = """
+    MATCH (c:MataKuliah)
+    WHERE c.ruangan IS NOT NULL
+    WITH c.ruangan AS ruangan, collect(c.kode) AS kodes
+    WHERE size(kodes) > 1
+    RETURN ruangan, kodes
+    ORDER BY ruangan
+"""
+
+
+def _hapus_bentrok_tx(tx, kodes):
+    tx.run(HAPUS_BENTROK, kodes=kodes)
+
+
+def _hitung_bentrok_tx(tx, kodes):
+    tx.run(HITUNG_BENTROK_MAHASISWA, kodes=kodes)
+    tx.run(HITUNG_BENTROK_DOSEN, kodes=kodes)
+
+
+def _refresh_tx(tx, kodes):
+    _hapus_bentrok_tx(tx, kodes)
+    _hitung_bentrok_tx(tx, kodes)
+    tx.run(NAIKKAN_VERSI, nama=META_NAMA)
+    tx.run(TANDAI_BERUBAH, kodes=kodes, nama=META_NAMA)
+
+
+def refresh_conflicts(session, kodes):
+    # Dipanggil setelah MK dibuat/diedit atau setelah relasi MENGAMBIL/MENGAJAR
+    # berubah. Hanya edge yang menyentuh `kodes` yang dihapus dan dihitung ulang.
+    # Untuk MK yang dihapus cukup bump_version: DETACH DELETE sudah membuang edgenya.
+    kodes = sorted(set(kodes))
+    if not kodes:
+        return
+    session.execute_write(_refresh_tx, kodes)
+
+
+def _rebuild_tx(tx):
+    tx.run(REBUILD_HAPUS, jenis=JENIS_BENTROK)
+    # Cek bentrok mahasiswa
+    tx.run(REBUILD_MAHASISWA)
+    # Cek bentrok dosen
+    tx.run(REBUILD_DOSEN)
+    tx.run(NAIKKAN_VERSI + "SET m.konflik_siap = true", nama=META_NAMA)
+    # Semua edge bisa berubah: jadwal tersimpan diperiksa ulang seluruhnya
+    tx.run(TANDAI_SEMUA, nama=META_NAMA)
+
+
+def rebuild_conflicts(session):
+    # Hitung ulang seluruh edge bentrok. Hanya untuk inisialisasi awal atau
+    # setelah impor data massal, bukan untuk setiap request.
+    session.execute_write(_rebuild_tx)
+
+
+def bump_version(session):
+    session.run(NAIKKAN_VERSI, nama=META_NAMA)
+
+
+def data_version(session):
+    # Satu query murah untuk cek versi data. Rebuild penuh hanya sekali,
+    # saat node penanda belum ada.
+    r = session.run(BACA_VERSI, nama=META_NAMA).single()
+    if not r or not r["siap"]:
+        rebuild_conflicts(session)
+        return data_version(session)
+    return r["versi"]
+
+
+def read_changed_courses(session):
+    # kode -> versi saat bentroknya terakhir berubah
+    result = session.run(BACA_BERUBAH)
+    return {r["kode"]: r["versi"] for r in result}
+
+
+def clear_changed_courses(session, berubah):
+    # Hanya penanda yang belum berubah lagi sejak dibaca (read_changed_courses)
+    if berubah:
+        session.run(HAPUS_TANDA, rows=[{"kode": k, "versi": v} for k, v in berubah.items()]).consume()
+
+
+def read_conflicts(session, jenis=JENIS_TERSIMPAN):
+    result = session.run(BACA_BENTROK, jenis=list(jenis))
+    return [(r["mk1"], r["mk2"]) for r in result]
+
+
+def read_course_codes(session):
+    # Semua MK, termasuk yang tidak punya konflik sama sekali
+    result = session.run(BACA_KODE_MK)
+    return [r["kode"] for r in result]
+
+
+def read_course_rooms(session):
+    # kode -> ruangan, untuk filter ruangan di sisi klien
+    result = session.run(BACA_RUANGAN_MK)
+    return {r["kode"]: r["ruangan"] for r in result}
+
+
+def read_room_cliques(session):
+    # Satu klik per ruangan yang dipakai lebih dari satu MK
+    result = session.run(BACA_KLIK_RUANGAN)
+    return [r["kodes"] for r in result]
+
+
+if __name__ == "__main__":
+    # Rebuild manual: python conflicts.py
+    from neo4j import GraphDatabase
+
+    driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "admin123"))
+    with driver.session(database="grafcoloring") as session:
+        rebuild_conflicts(session)
+        print(f"Jumlah konflik: {len(read_conflicts(session))}")
+        print(f"Jumlah ruangan bersama: {len(read_room_cliques(session))}")
+    driver.close()
@@ -0,0 +1,146 @@
+# === Chromatic number eksak: DSatur branch-and-bound ===
+# Batas atas awal dari heuristik DSatur, batas bawah dari klik maksimum yang
+# dicari secara greedy. Pencarian berhenti begitu batas atas = batas bawah,
+# pohon pencarian habis (optimal terbukti), atau batas waktu tercapai; hasil
+# terbaik sejauh ini selalu dikembalikan (anytime).
+import time
+
+from coloring import dsatur, jumlah_warna
+from compact_graph import as_compact
+
+
+def greedy_max_clique(adj, starts=64):
+    # Mulai dari `starts` simpul berderajat tertinggi, tambahkan kandidat
+    # berderajat tertinggi yang bertetangga dengan semua anggota klik.
+    # Set tetangga hanya dibuat untuk simpul yang benar-benar dikunjungi.
+    deg = [len(a) for a in adj]
+    adj_set = {}
+
+    def tetangga(v):
+        s = adj_set.get(v)
+        if s is None:
+            s = adj_set[v] = set(adj[v])
+        return s
+
+    terbaik = []
+    for s in sorted(range(len(adj)), key=lambda v: deg[v], reverse=True)[:starts]:
+        if deg[s] < len(terbaik):
+            break
+        klik = [s]
+        kandidat = set(adj[s])
+        # Tetangga s diurutkan sekali; kandidat berikutnya = yang pertama
+        # di urutan ini yang masih bertetangga dengan semua anggota klik
+        for v in sorted(adj[s], key=deg.__getitem__, reverse=True):
+            if v in kandidat:
+                klik.append(v)
+                kandidat &= tetangga(v)
+                # Tidak mungkin lagi melampaui klik terbaik
+                if not kandidat or len(klik) + len(kandidat) <= len(terbaik):
+                    break
+        if len(klik) > len(terbaik):
+            terbaik = klik
+    return terbaik
+
+
+def exact_chromatic(G, time_limit=10.0, clique_starts=64):
+    start = time.perf_counter()
+    g = as_compact(G)
+    n = len(g)
+
+    def hasil(lb, ub, colors, optimal, node_bnb):
+        return {
+            "lower": lb,
+            "upper": ub,
+            "coloring": g.to_mapping(colors),
+            "optimal": optimal,
+            "node_bnb": node_bnb,
+            "detik": time.perf_counter() - start,
+        }
+
+    if n == 0:
+        return hasil(0, 0, [], True, 0)
+
+    adj = g.expanded_adjacency()
+    deg = [len(a) for a in adj]
+
+    awal = dsatur(g)
+    best = [awal[node] for node in g.nodes]
+    ub = jumlah_warna(awal)
+    klik = greedy_max_clique(adj, clique_starts)
+    lb = len(klik)
+    if lb >= ub:
+        return hasil(ub, ub, best, True, 0)
+
+    # Status pencarian: cnt[v][c] = jumlah tetangga v yang berwarna c
+    color = [-1] * n
+    cnt = [[0] * ub for _ in range(n)]
+    sat = [0] * n
+
+    def assign(v, c):
+        color[v] = c
+        for u in adj[v]:
+            if cnt[u][c] == 0:
+                sat[u] += 1
+            cnt[u][c] += 1
+
+    def unassign(v, c):
+        color[v] = -1
+        for u in adj[v]:
+            cnt[u][c] -= 1
+            if cnt[u][c] == 0:
+                sat[u] -= 1
+
+    # Anggota klik pasti berbeda warna: diwarnai 0..lb-1 untuk memutus simetri
+    for c, v in enumerate(klik):
+        assign(v, c)
+    uncolored = set(range(n)) - set(klik)
+
+    def frame(used):
+        v = max(uncolored, key=lambda u: (sat[u], deg[u]))
+        cands = [c for c in range(used) if cnt[v][c] == 0]
+        cands.append(used)  # warna baru, dipangkas nanti bila tidak < ub
+        return [v, cands, 0, -1, used]
+
+    node_bnb = 0
+    used = lb
+    stack = [frame(used)]
+    timeout = False
+    while stack:
+        if node_bnb % 256 == 0 and time.perf_counter() - start > time_limit:
+            timeout = True
+            break
+        f = stack[-1]
+        v, cands, idx, prev, used_before = f
+        if prev >= 0:
+            unassign(v, prev)
+            uncolored.add(v)
+            f[3] = -1
+            used = used_before
+
+        # Lewati warna yang membuat jumlah warna >= ub (ub bisa turun selama pencarian)
+        while idx < len(cands) and max(used_before, cands[idx] + 1) >= ub:
+            idx += 1
+        if idx == len(cands):
+            stack.pop()
+            continue
+
+        c = cands[idx]
+        f[2] = idx + 1
+        f[3] = c
+        assign(v, c)
+        uncolored.discard(v)
+        used = max(used_before, c + 1)
+        node_bnb += 1
+
+        if not uncolored:
+            best = color[:]
+            ub = used
+            if ub <= lb:
+                break
+            continue
+        stack.append(frame(used))
+
+    optimal = not timeout
+    if optimal:
+        lb = ub
+    return hasil(lb, ub, best, optimal, node_bnb)
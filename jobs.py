@@ -0,0 +1,85 @@
+# === Antrean job latar in-process ===
+# Pekerjaan panjang (sinkronisasi jadwal) dijalankan di thread pool satu
+# worker sehingga request HTTP langsung kembali dengan id job. Job dengan
+# kunci yang sama yang masih antre/berjalan tidak dibuat ulang: pengirim
+# kedua mendapat job yang sudah ada. Job selesai disimpan sementara (TTL)
+# supaya statusnya masih bisa dibaca.
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import TTLCache
+
+_executor = None
+_lock = threading.Lock()
+_aktif = {}
+_jobs = TTLCache(maxsize=64, ttl=3600)
+
+
+class Job:
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = "antre"
+        self.stage = "antre"
+        self.ditulis = 0
+        self.mulai = time.time()
+        self.selesai = None
+        self.hasil = None
+        self.error = None
+
+    def update(self, **kwargs):
+        for nama, nilai in kwargs.items():
+            setattr(self, nama, nilai)
+
+    def to_dict(self):
+        akhir = self.selesai or time.time()
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "ditulis": self.ditulis,
+            "detik": round(akhir - self.mulai, 3),
+            "hasil": self.hasil,
+            "error": self.error,
+        }
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job")
+    return _executor
+
+
+def _jalankan(job, fn, args):
+    job.update(status="berjalan")
+    try:
+        job.update(hasil=fn(job, *args), status="selesai", stage="selesai")
+    except Exception as e:
+        logging.getLogger(__name__).exception("Job %s (%s) gagal", job.id, job.key)
+        job.update(status="gagal", error=str(e))
+    finally:
+        job.selesai = time.time()
+        with _lock:
+            _aktif.pop(job.key, None)
+
+
+def submit(key, fn, *args):
+    # fn(job, *args) dipanggil di thread latar dan boleh memanggil job.update().
+    # Mengembalikan (job, baru); baru=False bila job dengan kunci ini masih jalan.
+    with _lock:
+        job = _aktif.get(key)
+        if job is not None:
+            return job, False
+        job = Job(key)
+        _aktif[key] = job
+        _jobs.set(job.id, job)
+    _get_executor().submit(_jalankan, job, fn, args)
+    return job, True
+
+
+def get_job(job_id):
+    return _jobs.get(job_id)
@@ -0,0 +1,231 @@
+# === Layout graf konflik yang skalabel ===
+# - Posisi simpul disimpan ke file (kode -> [x, y]) dan dipakai lagi sebagai
+#   warm start: hanya MK baru yang dicarikan posisi, yang lama tidak bergeser.
+# - Layout awal dihitung per komponen terhubung lalu dipak dalam grid:
+#   spring (Fruchterman-Reingold networkx) untuk komponen kecil, spectral
+#   sparse (eigsh atas adjacency ternormalisasi) untuk komponen besar.
+# - Level of detail: graf quotient per slot dan ego network satu MK.
+# Klik ruangan dihubungkan sebagai bintang ke anggota pertama: cukup untuk
+# mendekatkan anggotanya tanpa membuat O(k²) edge.
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import eigsh
+except ImportError:  # tanpa scipy, komponen besar memakai posisi acak
+    sparse = None
+    eigsh = None
+
+from compact_graph import as_compact
+from components import connected_components
+
+# Default di samping modul ini, bukan di direktori kerja saat server dijalankan
+LAYOUT_FILE = os.environ.get("LAYOUT_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "layout_pos.json"))
+# Komponen lebih besar dari ini tidak lagi memakai spring layout
+SPRING_MAKS = 1500
+_lock = threading.Lock()
+
+
+def load_positions(path=LAYOUT_FILE):
+    try:
+        with open(path) as f:
+            return {kode: tuple(xy) for kode, xy in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_positions(pos, path=LAYOUT_FILE):
+    # Tulis ke file sementara (nama unik, jadi aman antar proses) lalu ganti,
+    # supaya file tidak pernah setengah jadi. Gagal tulis (mis. direktori
+    # read-only) hanya dicatat: posisi di memori tetap dipakai.
+    tmp = None
+    try:
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path) or ".", prefix=".layout-",
+                                         suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            json.dump({kode: [x, y] for kode, (x, y) in pos.items()}, f)
+        os.replace(tmp, path)
+    except OSError:
+        logging.getLogger(__name__).warning("Posisi layout tidak bisa disimpan ke %s", path, exc_info=True)
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _layout_edges(g, ids=None):
+    # Edge untuk perhitungan layout (id lokal bila `ids` diberikan)
+    lokal = {v: i for i, v in enumerate(ids)} if ids is not None else None
+    edges = []
+    for u, v in g.edges():
+        if lokal is None:
+            edges.append((u, v))
+        elif u in lokal and v in lokal:
+            edges.append((lokal[u], lokal[v]))
+    for q in g.cliques:
+        anggota = q if lokal is None else [lokal[v] for v in q if v in lokal]
+        edges.extend((anggota[0], v) for v in anggota[1:])
+    return edges
+
+
+def spectral_positions(n, edges, seed=42):
+    # Dua eigenvektor non-trivial terbesar dari D^-1/2 A D^-1/2 (sparse)
+    rng = np.random.default_rng(seed)
+    if n <= 3 or sparse is None or not edges:
+        return rng.uniform(-1, 1, size=(n, 2))
+    e = np.asarray(edges, dtype=np.int64)
+    rows = np.concatenate([e[:, 0], e[:, 1]])
+    cols = np.concatenate([e[:, 1], e[:, 0]])
+    A = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    d = 1.0 / np.sqrt(np.maximum(np.asarray(A.sum(axis=1)).ravel(), 1.0))
+    M = sparse.diags(d) @ A @ sparse.diags(d)
+    _, vecs = eigsh(M, k=3, which="LA", v0=rng.uniform(size=n), tol=1e-4, maxiter=n * 10)
+    xy = vecs[:, :2]
+    xy = xy - xy.mean(axis=0)
+    skala = np.abs(xy).max() or 1.0
+    return xy / skala + rng.normal(scale=1e-3, size=(n, 2))
+
+
+def _layout_komponen(g, ids, seed):
+    n = len(ids)
+    if n == 1:
+        return np.zeros((1, 2))
+    edges = _layout_edges(g, ids)
+    if n <= SPRING_MAKS:
+        H = nx.Graph()
+        H.add_nodes_from(range(n))
+        H.add_edges_from(edges)
+        pos = nx.spring_layout(H, seed=seed, iterations=50)
+        return np.array([pos[i] for i in range(n)])
+    return spectral_positions(n, edges, seed)
+
+
+def fresh_layout(g, seed=42):
+    # Layout dari nol: tiap komponen di kotak sebesar √ukuran, disusun dalam grid
+    komponen = connected_components(g)
+    kolom = max(1, math.ceil(math.sqrt(len(komponen))))
+    pos = {}
+    x0 = y0 = tinggi_baris = 0.0
+    for i, ids in enumerate(komponen):
+        if i and i % kolom == 0:
+            x0, y0, tinggi_baris = 0.0, y0 - tinggi_baris - 1.0, 0.0
+        r = math.sqrt(len(ids))
+        xy = _layout_komponen(g, ids, seed) * r
+        for v, (x, y) in zip(ids, xy):
+            pos[g.nodes[v]] = (x0 + r + float(x), y0 - r + float(y))
+        x0 += 2 * r + 1.0
+        tinggi_baris = max(tinggi_baris, 2 * r)
+    return pos
+
+
+def warm_layout(g, lama, seed=42, iterations=30):
+    # MK baru ditaruh di rata-rata posisi tetangga yang sudah punya posisi
+    # (plus jitter kecil); MK lama tetap di tempatnya
+    g = as_compact(g)
+    pos = {node: lama[node] for node in g.nodes if node in lama}
+    if not pos:
+        return fresh_layout(g, seed)
+    baru = [v for v, node in enumerate(g.nodes) if node not in pos]
+    if not baru:
+        return pos
+
+    rnd = random.Random(seed)
+    adj = g.expanded_adjacency()
+    xs = [x for x, _ in pos.values()]
+    ys = [y for _, y in pos.values()]
+    belum = baru
+    while belum:
+        sisa = []
+        for v in belum:
+            tetangga = [pos[g.nodes[u]] for u in adj[v] if g.nodes[u] in pos]
+            if tetangga:
+                x = sum(p[0] for p in tetangga) / len(tetangga) + rnd.uniform(-0.05, 0.05)
+                y = sum(p[1] for p in tetangga) / len(tetangga) + rnd.uniform(-0.05, 0.05)
+                pos[g.nodes[v]] = (x, y)
+            else:
+                sisa.append(v)
+        if len(sisa) == len(belum):
+            # Tidak terhubung ke simpul berposisi: taruh acak di dalam bbox
+            for v in sisa:
+                pos[g.nodes[v]] = (rnd.uniform(min(xs), max(xs)), rnd.uniform(min(ys), max(ys)))
+            break
+        belum = sisa
+
+    if len(g) <= SPRING_MAKS:
+        # Relaksasi singkat dengan simpul lama dikunci
+        H = nx.Graph()
+        H.add_nodes_from(g.nodes)
+        H.add_edges_from((g.nodes[u], g.nodes[v]) for u, v in _layout_edges(g))
+        tetap = [node for node in g.nodes if node in lama]
+        hasil = nx.spring_layout(H, pos=pos, fixed=tetap, iterations=iterations, seed=seed)
+        pos = {node: (float(x), float(y)) for node, (x, y) in hasil.items()}
+    return pos
+
+
+def layout_graph(G, path=LAYOUT_FILE, persist=True):
+    # Posisi untuk semua simpul G (graf utuh). File posisi ditulis ulang bila
+    # ada MK baru atau MK yang sudah dihapus masih tersimpan di sana.
+    g = as_compact(G)
+    with _lock:
+        lama = load_positions(path) if persist else {}
+        # Dibulatkan sama seperti di file supaya posisi stabil antar run
+        pos = {node: (round(x, 5), round(y, 5)) for node, (x, y) in warm_layout(g, lama).items()}
+        if persist and (len(lama) != len(pos) or any(node not in lama for node in g.nodes)):
+            save_positions(pos, path)
+    return pos
+
+
+def quotient_graph(G, coloring):
+    # Satu simpul per slot (atribut `ukuran` = jumlah MK), bobot edge = jumlah
+    # konflik antar dua slot
+    g = as_compact(G)
+    Q = nx.Graph()
+    for node in g.nodes:
+        slot = coloring.get(node, 0)
+        if slot in Q:
+            Q.nodes[slot]["ukuran"] += 1
+        else:
+            Q.add_node(slot, ukuran=1)
+    slot_of = [coloring.get(node, 0) for node in g.nodes]
+    bobot = Counter()
+    for u, v in g.edges():
+        a, b = slot_of[u], slot_of[v]
+        if a != b:
+            bobot[min(a, b), max(a, b)] += 1
+    for q in g.cliques:
+        # Pasangan antar slot di satu klik = perkalian jumlah anggotanya
+        per_slot = sorted(Counter(slot_of[v] for v in q).items())
+        for i, (a, na) in enumerate(per_slot):
+            for b, nb in per_slot[i + 1:]:
+                bobot[a, b] += na * nb
+    Q.add_weighted_edges_from((a, b, w) for (a, b), w in bobot.items())
+    return Q
+
+
+def ego_graph(G, kode, radius=1):
+    # Subgraf MK `kode` beserta tetangga sampai jarak `radius`
+    g = as_compact(G)
+    adj = g.expanded_adjacency()
+    pusat = g.index[kode]
+    jarak = {pusat: 0}
+    frontier = [pusat]
+    for r in range(radius):
+        berikut = []
+        for v in frontier:
+            for u in adj[v]:
+                if u not in jarak:
+                    jarak[u] = r + 1
+                    berikut.append(u)
+        frontier = berikut
+    return g.subgraph(sorted(jarak))
@@ -0,0 +1,219 @@
+# === Instrumentasi: span per tahap, histogram latensi, format Prometheus ===
+# Tanpa dependensi tambahan. Setiap span diukur dengan time.perf_counter()
+# dan dimasukkan ke histogram berlabel; /metrics di app.py menyajikan
+# render_prometheus(). Kolektor tambahan (mis. statistik cache) bisa
+# didaftarkan dengan register_collector().
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(nilai):
+    return str(nilai).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(nama_label, nilai, tambahan=None):
+    pasangan = [f'{k}="{_escape(v)}"' for k, v in zip(nama_label, nilai)]
+    if tambahan:
+        pasangan.append(tambahan)
+    return "{" + ",".join(pasangan) + "}" if pasangan else ""
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(k, "") for k in self.labels)
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                # [hitungan per bucket..., jumlah, total]
+                data = self._data[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, batas in enumerate(self.buckets):
+                if value <= batas:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._data.items())
+        for key, data in items:
+            for batas, n in zip(self.buckets, data):
+                le = 'le="%s"' % batas
+                yield f"{self.name}_bucket{_labels(self.labels, key, le)} {n}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_labels(self.labels, key, le)} {data[-1]}"
+            yield f"{self.name}_sum{_labels(self.labels, key)} {data[-2]}"
+            yield f"{self.name}_count{_labels(self.labels, key)} {data[-1]}"
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(k, "") for k in self.labels)
+        with self._lock:
+            self._data[key] = self._data.get(key, 0) + amount
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._data.items())
+        for key, n in items:
+            yield f"{self.name}{_labels(self.labels, key)} {n}"
+
+
+stage_seconds = Histogram("grafcoloring_stage_seconds", "Durasi tiap tahap pipeline (detik).", ["stage"])
+stage_errors = Counter("grafcoloring_stage_errors_total", "Jumlah tahap yang berakhir dengan exception.", ["stage"])
+query_seconds = Histogram("grafcoloring_neo4j_query_seconds", "Durasi satu query Neo4j (detik).", ["query"])
+query_errors = Counter("grafcoloring_neo4j_query_errors_total", "Jumlah query Neo4j yang gagal.", ["query"])
+tx_seconds = Histogram("grafcoloring_neo4j_transaction_seconds",
+                       "Durasi satu transaksi execute_read/execute_write Neo4j, termasuk retry (detik).", ["tx"])
+tx_errors = Counter("grafcoloring_neo4j_transaction_errors_total", "Jumlah transaksi Neo4j yang gagal.", ["tx"])
+request_seconds = Histogram("grafcoloring_http_request_seconds", "Durasi request HTTP (detik).", ["endpoint", "status"])
+
+_metrik = [stage_seconds, stage_errors, query_seconds, query_errors, tx_seconds, tx_errors, request_seconds]
+_kolektor = []
+
+
+def register_collector(fn):
+    # fn() -> iterable baris teks Prometheus (HELP/TYPE/sampel)
+    _kolektor.append(fn)
+    return fn
+
+
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, stage=stage)
+
+
+_nama_konstanta = None
+
+
+def _nama_query(query):
+    # Label = nama query di schema.QUERY_APLIKASI (konstanta yang dijalankan
+    # aplikasi); query lain memakai awal teksnya. schema diimpor saat dipakai
+    # karena schema -> storage -> metrics.
+    global _nama_konstanta
+    if _nama_konstanta is None:
+        from schema import QUERY_APLIKASI
+        _nama_konstanta = {" ".join(q.split()): nama for nama, q in QUERY_APLIKASI}
+    teks = " ".join(query.split())
+    return _nama_konstanta.get(teks, teks[:60])
+
+
+def _ukur(histogram, errors, label, fn):
+    start = time.perf_counter()
+    try:
+        return fn()
+    except BaseException:
+        errors.inc(**{histogram.labels[0]: label})
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **{histogram.labels[0]: label})
+
+
+def _run_terukur(target, query, parameters, kwargs):
+    def jalan():
+        result = target.run(query, parameters, **kwargs)
+        records = list(result)
+        return _Hasil(records, result.consume())
+    return _ukur(query_seconds, query_errors, _nama_query(query), jalan)
+
+
+class _Hasil:
+    # Hasil query yang sudah dibaca penuh (supaya durasi mencakup transfer data).
+    # Mendukung pemakaian yang ada di repo: iterasi, single(), consume(), data().
+    def __init__(self, records, summary):
+        self._records = records
+        self._summary = summary
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self):
+        return [r.data() for r in self._records]
+
+    def consume(self):
+        return self._summary
+
+
+class _TimedTx:
+    # Transaksi di dalam execute_read/execute_write: tiap tx.run() tetap
+    # tercatat per query
+    def __init__(self, tx):
+        self._tx = tx
+
+    def __getattr__(self, nama):
+        return getattr(self._tx, nama)
+
+    def run(self, query, parameters=None, **kwargs):
+        return _run_terukur(self._tx, query, parameters, kwargs)
+
+
+class TimedSession:
+    # Pembungkus session Neo4j: tiap run() (juga di dalam transaksi) dicatat di
+    # grafcoloring_neo4j_query_seconds per query, tiap execute_read/execute_write
+    # di grafcoloring_neo4j_transaction_seconds. Atribut lain diteruskan apa adanya.
+    def __init__(self, session):
+        self._session = session
+
+    def __enter__(self):
+        self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._session.__exit__(*exc)
+
+    def __getattr__(self, nama):
+        return getattr(self._session, nama)
+
+    def run(self, query, parameters=None, **kwargs):
+        return _run_terukur(self._session, query, parameters, kwargs)
+
+    def _transaksi(self, eksekusi, fn, args, kwargs):
+        def dalam(tx, *a, **kw):
+            return fn(_TimedTx(tx), *a, **kw)
+        return _ukur(tx_seconds, tx_errors, fn.__name__, lambda: eksekusi(dalam, *args, **kwargs))
+
+    def execute_read(self, fn, *args, **kwargs):
+        return self._transaksi(self._session.execute_read, fn, args, kwargs)
+
+    def execute_write(self, fn, *args, **kwargs):
+        return self._transaksi(self._session.execute_write, fn, args, kwargs)
+
+
+def render_prometheus():
+    baris = []
+    for m in _metrik:
+        baris.extend(m.collect())
+    for fn in _kolektor:
+        baris.extend(fn())
+    return "\n".join(baris) + "\n"
@@ -0,0 +1,148 @@
+# === Portfolio pewarnaan paralel dengan batas waktu ===
+# Beberapa strategi dijalankan bersamaan di process pool. Setelah budget habis
+# (atau semua selesai), hasil dengan slot paling sedikit yang dipakai.
+# Pool portfolio hidup selama proses: dsatur, welsh_powell dan greedy acak
+# berhenti sendiri saat deadline lewat, hasil yang terlambat dibuang.
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from coloring import dsatur, greedy, jumlah_warna, welsh_powell
+from compact_graph import as_compact
+
+WORKERS = os.cpu_count() or 1
+
+_pool = None
+_pool_lock = threading.Lock()
+_portfolio_pool = None
+_portfolio_lock = threading.Lock()
+
+
+def mp_context():
+    # Jangan fork dari proses Flask yang sudah punya thread job/render.
+    # Server forkserver sudah memuat modul pewarnaan dan skrip utama (sekali,
+    # bukan per worker), jadi worker baru cepat siap. Skrip utama tidak boleh
+    # punya efek samping berat saat diimpor (app.py membuat repository lazily).
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["__main__", "coloring", "compact_graph", "portfolio"])
+    return ctx
+
+
+def get_pool():
+    # Pool bersama untuk pekerjaan yang selalu ditunggu sampai selesai
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=mp_context())
+        return _pool
+
+
+def _greedy_acak(g, seed, deadline):
+    # Random restart sampai deadline. Berhenti bila percobaan berikutnya
+    # diperkirakan tidak selesai sebelum deadline; None bila mulai terlambat.
+    terbaik = None
+    while time.time() < deadline:
+        mulai = time.time()
+        coloring = greedy(g, order="random", seed=seed)
+        if terbaik is None or jumlah_warna(coloring) < jumlah_warna(terbaik):
+            terbaik = coloring
+        seed += 1_000_003
+        sekarang = time.time()
+        if sekarang + (sekarang - mulai) >= deadline:
+            break
+    return terbaik
+
+
+def _jalankan(nama, g, seed, deadline):
+    # None = deadline lewat sebelum selesai. Greedy deterministik tidak mengenal
+    # deadline: keduanya murah dan menjamin selalu ada jawaban.
+    if nama == "welsh_powell":
+        return welsh_powell(g, deadline)
+    if nama == "dsatur":
+        return dsatur(g, deadline)
+    if nama == "greedy_largest_first":
+        return greedy(g, order="largest_first")
+    if nama == "greedy_smallest_last":
+        return greedy(g, order="smallest_last")
+    if nama == "greedy_random":
+        return _greedy_acak(g, seed, deadline)
+    raise ValueError(f"Strategi tidak dikenal: {nama}")
+
+
+def strategi(workers):
+    # Strategi deterministik dulu (urutan ini juga pemutus seri), sisa core
+    # dipakai untuk greedy urutan acak dengan seed berbeda
+    daftar = [
+        ("dsatur", 0),
+        ("welsh_powell", 0),
+        ("greedy_smallest_last", 0),
+        ("greedy_largest_first", 0),
+    ]
+    daftar += [("greedy_random", seed) for seed in range(max(1, workers - len(daftar)))]
+    return daftar
+
+
+# Urutan submit: yang murah dulu, supaya dengan worker sedikit strategi mahal
+# tidak menahan hasil yang pasti selesai sebelum budget
+BIAYA = {"greedy_largest_first": 0, "greedy_smallest_last": 1, "welsh_powell": 2, "dsatur": 3,
+         "greedy_random": 4}
+
+
+def run_portfolio(G, budget_ms=500):
+    # Mengembalikan (coloring terbaik, ringkasan per strategi)
+    global _portfolio_pool
+    g = as_compact(G)
+    budget = budget_ms / 1000
+    deadline = time.time() + budget
+    daftar = strategi(WORKERS)
+    masuk = queue.Queue()
+    hasil = {}
+
+    # Pool dibuat sekali dan tidak pernah dihentikan; run yang bersamaan antre
+    # di worker yang sama. Hasil yang datang setelah run selesai masuk ke
+    # antrean run itu dan diabaikan.
+    with _portfolio_lock:
+        if _portfolio_pool is None:
+            _portfolio_pool = mp_context().Pool(WORKERS)
+        for i in sorted(range(len(daftar)), key=lambda i: BIAYA[daftar[i][0]]):
+            nama, seed = daftar[i]
+            _portfolio_pool.apply_async(
+                _jalankan, (nama, g, seed, deadline),
+                callback=lambda coloring, i=i: masuk.put((i, coloring, None)),
+                error_callback=lambda e, i=i: masuk.put((i, None, e)),
+            )
+    selesai = 0
+    while selesai < len(daftar):
+        sisa = deadline - time.time()
+        if sisa <= 0 and hasil:
+            break
+        # Budget terlalu kecil: tunggu hasil pertama supaya selalu ada jawaban
+        try:
+            i, coloring, error = masuk.get(timeout=sisa if sisa > 0 else None)
+        except queue.Empty:
+            continue
+        if error is not None:
+            raise error
+        selesai += 1
+        if coloring is not None:
+            hasil[i] = coloring
+
+    ringkasan = []
+    terbaik = None
+    for prioritas, (nama, seed) in enumerate(daftar):
+        if prioritas not in hasil:
+            ringkasan.append({"strategi": nama, "seed": seed, "slot": None})
+            continue
+        coloring = hasil[prioritas]
+        slot = jumlah_warna(coloring)
+        ringkasan.append({"strategi": nama, "seed": seed, "slot": slot})
+        if terbaik is None or (slot, prioritas) < terbaik[0]:
+            terbaik = ((slot, prioritas), nama, coloring)
+
+    _, pemenang, coloring = terbaik
+    return coloring, {"pemenang": pemenang, "strategi": ringkasan}
@@ -0,0 +1,103 @@
+# === Pewarnaan ulang inkremental ===
+# Mulai dari pewarnaan sebelumnya (mis. jadwal yang sudah tersimpan), hanya
+# simpul yang bermasalah yang diwarnai ulang: MK baru dan MK yang kini bentrok
+# dengan tetangga berwarna sama. Perbaikan: warna bebas di palet yang ada,
+# lalu tukar rantai Kempe (a/b) yang dibatasi ukurannya, dan baru terakhir
+# warna baru. Slot MK lain tidak berubah.
+from collections import deque
+from itertools import chain
+
+from compact_graph import as_compact
+
+# Rantai Kempe lebih besar dari ini tidak ditukar (terlalu banyak MK pindah)
+KEMPE_MAKS = 32
+
+
+def recolor_incremental(G, previous, changed=None, kempe_maks=KEMPE_MAKS):
+    # previous: dict kode -> slot. changed: kode yang edge-nya berubah (delta);
+    # None = periksa semua edge. Mengembalikan (coloring, info).
+    g = as_compact(G)
+    n = len(g)
+    adj = g.adjacency()
+    cliques = g.cliques
+    node_q = g.node_cliques()
+
+    def tetangga(v):
+        if node_q[v]:
+            return [u for u in chain(adj[v], *(cliques[q] for q in node_q[v])) if u != v]
+        return adj[v]
+
+    color = [previous.get(node, -1) for node in g.nodes]
+    k = max(color, default=-1) + 1
+
+    # Simpul bermasalah: belum punya warna, atau bentrok dengan tetangga
+    if changed is None:
+        periksa = range(n)
+    else:
+        periksa = {g.index[kode] for kode in changed if kode in g.index}
+    rusak = []
+    for v in periksa:
+        if color[v] < 0 or any(color[u] == color[v] for u in tetangga(v)):
+            rusak.append(v)
+    # Satu sisi edge bentrok cukup diwarnai ulang: lepas semua dulu lalu
+    # warnai ulang dari yang berderajat terbesar
+    for v in rusak:
+        color[v] = -1
+    rusak.sort(key=lambda v: len(tetangga(v)), reverse=True)
+
+    def rantai_kempe(awal, a, b):
+        # Komponen (a,b) yang memuat `awal`; None bila melebihi batas
+        dilihat = set(awal)
+        antrian = deque(awal)
+        while antrian:
+            x = antrian.popleft()
+            for y in tetangga(x):
+                if y not in dilihat and color[y] in (a, b):
+                    dilihat.add(y)
+                    if len(dilihat) > kempe_maks:
+                        return None
+                    antrian.append(y)
+        return dilihat
+
+    kempe = 0
+    for v in rusak:
+        nbrs = tetangga(v)
+        dipakai = {color[u] for u in nbrs if color[u] >= 0}
+        bebas = next((c for c in range(k) if c not in dipakai), None)
+        if bebas is not None:
+            color[v] = bebas
+            continue
+
+        # Kosongkan warna a di sekitar v dengan menukar rantai Kempe a<->b
+        terbaik = None
+        for a in range(k):
+            sumber = [u for u in nbrs if color[u] == a]
+            for b in range(k):
+                if b == a:
+                    continue
+                rantai = rantai_kempe(sumber, a, b)
+                if rantai is None or any(u in rantai for u in nbrs if color[u] == b):
+                    continue
+                if terbaik is None or len(rantai) < len(terbaik[2]):
+                    terbaik = (a, b, rantai)
+        if terbaik is not None:
+            a, b, rantai = terbaik
+            for x in rantai:
+                color[x] = b if color[x] == a else a
+            color[v] = a
+            kempe += 1
+            continue
+
+        color[v] = k
+        k += 1
+
+    coloring = g.to_mapping(color)
+    berubah = [node for node in g.nodes if previous.get(node) != coloring[node]]
+    info = {
+        "dipindah": sum(1 for node in berubah if node in previous),
+        "baru": sum(1 for node in berubah if node not in previous),
+        "dihapus": sum(1 for node in previous if node not in g.index),
+        "kempe": kempe,
+        "berubah": berubah,
+    }
+    return coloring, info
@@ -0,0 +1,127 @@
+# === Reduksi graf sebelum pewarnaan ===
+# - Simpul berderajat < batas bawah klik (lb) dikupas: berapa pun pewarnaan
+#   kernel (>= lb warna), simpul ini selalu dapat warna saat dimasukkan lagi.
+#   MK tanpa konflik (derajat 0) ikut tertangani di sini.
+# - Simpul v yang didominasi u (tidak bertetangga, N(v) ⊆ N(u)) dibuang dan
+#   nanti cukup memakai warna u.
+# Kernel yang tersisa dikirim ke algoritma mahal, lalu simpul yang dibuang
+# dimasukkan lagi dengan urutan terbalik secara greedy.
+from itertools import chain
+
+from coloring import _warna_terkecil
+from compact_graph import as_compact
+from exact import greedy_max_clique
+
+# Cek dominasi hanya untuk simpul berderajat kecil supaya tetap murah
+DOMINASI_MAKS = 32
+
+
+def clique_lower_bound(g):
+    # Klik ruangan terbesar atau klik greedy di edge biasa
+    lb = max((len(q) for q in g.cliques), default=0)
+    lb = max(lb, len(greedy_max_clique(g.adjacency())))
+    return max(lb, 1) if len(g) else 0
+
+
+def reduce_graph(G):
+    # Mengembalikan (kernel, ids_kernel, langkah, lb). `langkah` berisi
+    # ("kupas", v) / ("dominasi", v, u) sesuai urutan pembuangan.
+    g = as_compact(G)
+    n = len(g)
+    adj = g.adjacency()
+    cliques = g.cliques
+    node_q = g.node_cliques()
+    adj_set = [set(a) for a in adj]
+    deg = g.degrees()
+    alive = [True] * n
+    lb = clique_lower_bound(g)
+    langkah = []
+
+    def tetangga(v):
+        if node_q[v]:
+            return chain(adj[v], *(cliques[q] for q in node_q[v]))
+        return adj[v]
+
+    def buang(v):
+        alive[v] = False
+        for u in tetangga(v):
+            if alive[u]:
+                deg[u] -= 1
+
+    def bertetangga(u, x):
+        return x in adj_set[u] or any(q in node_q[x] for q in node_q[u])
+
+    def kupas(calon):
+        berubah = False
+        stack = [v for v in calon if alive[v] and deg[v] < lb]
+        while stack:
+            v = stack.pop()
+            if not alive[v]:
+                continue
+            buang(v)
+            langkah.append(("kupas", v))
+            berubah = True
+            for u in tetangga(v):
+                if alive[u] and deg[u] < lb:
+                    stack.append(u)
+        return berubah
+
+    def dominasi():
+        berubah = False
+        for v in range(n):
+            if not alive[v] or deg[v] > DOMINASI_MAKS:
+                continue
+            nv = {u for u in tetangga(v) if alive[u] and u != v}
+            if not nv:
+                continue
+            w = min(nv, key=deg.__getitem__)
+            for u in tetangga(w):
+                if u == v or not alive[u] or u in nv or deg[u] < len(nv):
+                    continue
+                if all(bertetangga(u, x) for x in nv):
+                    buang(v)
+                    langkah.append(("dominasi", v, u))
+                    berubah = True
+                    break
+        return berubah
+
+    kupas(range(n))
+    while dominasi() and kupas(range(n)):
+        pass
+
+    ids = [v for v in range(n) if alive[v]]
+    return g.subgraph(ids), ids, langkah, lb
+
+
+def color_reduced(G, solver):
+    # solver(kernel) -> dict kode -> warna. Mengembalikan (coloring, info).
+    g = as_compact(G)
+    kernel, ids, langkah, lb = reduce_graph(g)
+    color = [-1] * len(g)
+    if len(kernel):
+        hasil = solver(kernel)
+        for i, v in enumerate(ids):
+            color[v] = hasil[kernel.nodes[i]]
+
+    adj = g.adjacency()
+    cliques = g.cliques
+    node_q = g.node_cliques()
+    for item in reversed(langkah):
+        v = item[1]
+        if item[0] == "dominasi":
+            color[v] = color[item[2]]
+            continue
+        mask = 0
+        for u in chain(adj[v], *(cliques[q] for q in node_q[v])):
+            if u != v and color[u] >= 0:
+                mask |= 1 << color[u]
+        color[v] = _warna_terkecil(mask)
+
+    info = {
+        "simpul": len(g),
+        "kernel": len(kernel),
+        "dikupas": sum(1 for x in langkah if x[0] == "kupas"),
+        "didominasi": sum(1 for x in langkah if x[0] == "dominasi"),
+        "lower": lb,
+    }
+    return g.to_mapping(color), info
@@ -0,0 +1,170 @@
+# === Bootstrap skema Neo4j: constraint unik dan index ===
+# Semua lookup aplikasi memfilter properti (MataKuliah.kode, User.id,
+# User.role, Jadwal.slot, MataKuliah.ruangan, Meta.nama). Tanpa index ini
+# semuanya jadi label scan. Statement memakai IF NOT EXISTS sehingga aman
+# dijalankan berulang (saat startup maupun manual: python schema.py).
+#
+# CLI juga mem-PROFILE query utama aplikasi sebelum dan sesudah skema dibuat
+# supaya terlihat planner memakai index. Query tulis di-PROFILE di dalam
+# transaksi yang di-rollback, jadi data tidak berubah.
+import logging
+
+import conflicts
+import sinkron
+import sparse_conflicts
+import storage
+from conflicts import META_NAMA
+
+# (nama, label, properti) constraint unik. Database lama bisa saja sudah berisi
+# nilai ganda; constraint itu dilewati (dengan peringatan) alih-alih membuat
+# server gagal start.
+UNIK = [
+    ("matakuliah_kode", "MataKuliah", "kode"),
+    ("user_id", "User", "id"),
+    ("jadwal_slot", "Jadwal", "slot"),
+    ("meta_nama", "Meta", "nama"),
+]
+INDEX = [
+    "CREATE INDEX user_role IF NOT EXISTS FOR (u:User) ON (u.role)",
+    "CREATE INDEX matakuliah_ruangan IF NOT EXISTS FOR (c:MataKuliah) ON (c.ruangan)",
+]
+BUAT_UNIK = "CREATE CONSTRAINT {nama} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+CARI_GANDA = """
+    MATCH (n:{label}) WHERE n.{prop} IS NOT NULL
+    WITH n.{prop} AS nilai, count(*) AS jumlah WHERE jumlah > 1
+    RETURN nilai, jumlah ORDER BY jumlah DESC, nilai LIMIT 10
+"""
+
+# (nama, query) yang dijalankan aplikasi, diambil langsung dari konstanta
+# modul pemakainya supaya tidak menyimpang; parameter diisi dari contoh data
+QUERY_APLIKASI = [
+    ("load_user", storage.BACA_USER),
+    ("list_mk", storage.DAFTAR_MK),
+    ("edit_mk", storage.BACA_MK),
+    ("tambah_mk", storage.TAMBAH_MK),
+    ("ubah_mk", storage.UBAH_MK),
+    ("hapus_mk", storage.HAPUS_MK),
+    ("info_jadwal", storage.INFO_JADWAL),
+    ("tambah_mengambil", storage.TAMBAH_MENGAMBIL),
+    ("tambah_mengajar", storage.TAMBAH_MENGAJAR),
+    ("hapus_mengambil", storage.HAPUS_MENGAMBIL),
+    ("hapus_mengajar", storage.HAPUS_MENGAJAR),
+    ("versi_data", conflicts.BACA_VERSI),
+    ("naikkan_versi", conflicts.NAIKKAN_VERSI),
+    ("baca_bentrok", conflicts.BACA_BENTROK),
+    ("kode_mk", conflicts.BACA_KODE_MK),
+    ("ruangan_mk", conflicts.BACA_RUANGAN_MK),
+    ("klik_ruangan", conflicts.BACA_KLIK_RUANGAN),
+    ("refresh_hapus_bentrok", conflicts.HAPUS_BENTROK),
+    ("refresh_bentrok_mahasiswa", conflicts.HITUNG_BENTROK_MAHASISWA),
+    ("refresh_bentrok_dosen", conflicts.HITUNG_BENTROK_DOSEN),
+    ("tandai_berubah", conflicts.TANDAI_BERUBAH),
+    ("tandai_semua", conflicts.TANDAI_SEMUA),
+    ("baca_berubah", conflicts.BACA_BERUBAH),
+    ("hapus_tanda", conflicts.HAPUS_TANDA),
+    ("rebuild_hapus", conflicts.REBUILD_HAPUS),
+    ("rebuild_mahasiswa", conflicts.REBUILD_MAHASISWA),
+    ("rebuild_dosen", conflicts.REBUILD_DOSEN),
+    ("insidensi_mahasiswa", sparse_conflicts.INSIDENSI_MAHASISWA),
+    ("insidensi_dosen", sparse_conflicts.INSIDENSI_DOSEN),
+    ("sinkron_baca", sinkron.BACA_JADWAL),
+    ("sinkron_slot", sinkron.TULIS_SLOT),
+    ("sinkron_lepas", sinkron.LEPAS_JADWAL),
+    ("sinkron_tulis", sinkron.TULIS_JADWAL),
+]
+
+# Parameter yang berbeda dari contoh umum: MK baru tidak boleh bentrok
+# dengan constraint kode unik
+PARAMETER_KHUSUS = {
+    "tambah_mk": {"k": "__profil__"},
+}
+
+
+def ensure_schema(session):
+    # Idempoten; menunggu index selesai dibangun sebelum kembali. Mengembalikan
+    # {nama constraint: [(nilai, jumlah), ...]} untuk constraint yang dilewati.
+    ada = set(session.run("SHOW CONSTRAINTS YIELD name RETURN collect(name) AS nama").single()["nama"])
+    dilewati = {}
+    for nama, label, prop in UNIK:
+        if nama not in ada:
+            ganda = [(r["nilai"], r["jumlah"]) for r in session.run(CARI_GANDA.format(label=label, prop=prop))]
+            if ganda:
+                logging.getLogger(__name__).warning(
+                    "Constraint %s dilewati: %s.%s punya nilai ganda (contoh: %s). Bersihkan datanya "
+                    "lalu jalankan python schema.py lagi.", nama, label, prop,
+                    ", ".join(f"{nilai!r} x{jumlah}" for nilai, jumlah in ganda))
+                dilewati[nama] = ganda
+                continue
+        session.run(BUAT_UNIK.format(nama=nama, label=label, prop=prop)).consume()
+    for statement in INDEX:
+        session.run(statement).consume()
+    session.run("CALL db.awaitIndexes(300)").consume()
+    return dilewati
+
+
+def _contoh_parameter(session):
+    r = session.run("""
+        OPTIONAL MATCH (c:MataKuliah) WITH c LIMIT 1
+        OPTIONAL MATCH (u:User) WITH c, u LIMIT 1
+        OPTIONAL MATCH (j:Jadwal) WITH c, u, j LIMIT 1
+        RETURN c.kode AS kode, u.id AS id, j.slot AS slot
+    """).single()
+    kode = r["kode"] or ""
+    slot = r["slot"] if r["slot"] is not None else 0
+    return {
+        "id": r["id"] or "",
+        "k": kode,
+        "n": "",
+        "r": "",
+        "kodes": [kode],
+        "rows": [{"kode": kode, "slot": slot}],
+        "slots": [{"slot": slot, "hari": "", "jam_mulai": "", "jam_selesai": ""}],
+        "jenis": conflicts.JENIS_BENTROK,
+        "nama": META_NAMA,
+    }
+
+
+def _jumlah_db_hits(plan):
+    return plan.get("dbHits", 0) + sum(_jumlah_db_hits(c) for c in plan.get("children", []))
+
+
+def _operator(plan):
+    nama = [plan.get("operatorType", "")]
+    for c in plan.get("children", []):
+        nama.extend(_operator(c))
+    return nama
+
+
+def profile_queries(session):
+    # {nama: (db_hits, operator index yang dipakai)}
+    params = _contoh_parameter(session)
+    hasil = {}
+    for nama, query in QUERY_APLIKASI:
+        tx = session.begin_transaction()
+        try:
+            summary = tx.run("PROFILE " + query, **{**params, **PARAMETER_KHUSUS.get(nama, {})}).consume()
+        finally:
+            tx.rollback()
+        plan = summary.profile or {}
+        index = sorted({op.split("@")[0] for op in _operator(plan) if "Index" in op or "Unique" in op})
+        hasil[nama] = (_jumlah_db_hits(plan), index)
+    return hasil
+
+
+if __name__ == "__main__":
+    # Bootstrap manual: python schema.py
+    from neo4j import GraphDatabase
+
+    driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "admin123"))
+    with driver.session(database="grafcoloring") as session:
+        sebelum = profile_queries(session)
+        dilewati = ensure_schema(session)
+        sesudah = profile_queries(session)
+    driver.close()
+
+    print(f"{'Query':<28}{'db hits sebelum':>16}{'db hits sesudah':>16}  Index")
+    for nama, _ in QUERY_APLIKASI:
+        hits_sesudah, index = sesudah[nama]
+        print(f"{nama:<28}{sebelum[nama][0]:>16}{hits_sesudah:>16}  {', '.join(index) or '-'}")
+    for nama, ganda in dilewati.items():
+        print(f"PERINGATAN: constraint {nama} dilewati, nilai ganda: {ganda}")
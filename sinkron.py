@@ -0,0 +1,111 @@
+# === Sinkronisasi hasil pewarnaan ke Neo4j secara diferensial ===
+# Jadwal yang tersimpan (kode -> slot) dibaca dalam satu query lalu
+# dibandingkan dengan pewarnaan baru; hanya MK baru, MK yang pindah slot dan
+# MK yang tidak lagi dijadwalkan yang ditulis (UNWIND per chunk), semuanya
+# dalam satu transaksi. Jadwal yang tidak berubah = hampir tanpa tulis.
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+BACA_JADWAL = """
+    MATCH (c:MataKuliah)-[:DIJADWALKAN]->(j:Jadwal)
+    RETURN c.kode AS kode, j.slot AS slot
+"""
+
+TULIS_SLOT = """
+    UNWIND $slots AS s
+    MERGE (j:Jadwal {slot:s.slot})
+    SET j.hari=s.hari, j.jam_mulai=s.jam_mulai, j.jam_selesai=s.jam_selesai
+"""
+
+LEPAS_JADWAL = """
+    UNWIND $kodes AS kode
+    MATCH (:MataKuliah {kode:kode})-[r:DIJADWALKAN]->()
+    DELETE r
+"""
+
+TULIS_JADWAL = """
+    UNWIND $rows AS row
+    MATCH (c:MataKuliah {kode:row.kode})
+    MATCH (j:Jadwal {slot:row.slot})
+    CREATE (c)-[:DIJADWALKAN]->(j)
+    RETURN count(c) AS ditulis
+"""
+
+
+def _baca_jadwal(tx):
+    result = tx.run(BACA_JADWAL)
+    return {r["kode"]: int(r["slot"]) for r in result}
+
+
+def read_schedule(session):
+    # Jadwal yang sedang tersimpan: kode -> slot (satu query)
+    return session.execute_read(_baca_jadwal)
+
+
+def diff_schedule(lama, baru):
+    # Mengembalikan (tambah, pindah, hapus): dua pertama list baris
+    # {"kode", "slot"}, yang terakhir list kode
+    tambah, pindah = [], []
+    for kode, slot in baru.items():
+        if kode not in lama:
+            tambah.append({"kode": kode, "slot": slot})
+        elif lama[kode] != slot:
+            pindah.append({"kode": kode, "slot": slot})
+    hapus = [kode for kode in lama if kode not in baru]
+    return tambah, pindah, hapus
+
+
+def _sync_tx(tx, pewarnaan, slot_to_hari_jam, chunk_size, on_chunk):
+    # execute_write bisa mengulang fungsi ini bila transaksi gagal sementara;
+    # progres percobaan sebelumnya ikut di-rollback, jadi hitungan mulai dari 0
+    if on_chunk is not None:
+        on_chunk(0)
+    lama = _baca_jadwal(tx)
+    tambah, pindah, hapus = diff_schedule(lama, pewarnaan)
+    rows = tambah + pindah
+
+    # Hari/jam ditulis ulang untuk setiap slot yang dipakai (paling banyak satu
+    # minggu kerja), supaya node Jadwal dari pemetaan slot lama ikut diperbaiki
+    # walaupun MK di slot itu tidak pindah
+    slots = []
+    for slot in sorted(set(pewarnaan.values())):
+        hari, jam_mulai, jam_selesai = slot_to_hari_jam(slot)
+        slots.append({"slot": slot, "hari": hari, "jam_mulai": jam_mulai, "jam_selesai": jam_selesai})
+    if slots:
+        tx.run(TULIS_SLOT, slots=slots)
+
+    # MK yang pindah atau tidak lagi dijadwalkan: lepas relasi lamanya
+    lepas = [r["kode"] for r in pindah] + hapus
+    for i in range(0, len(lepas), chunk_size):
+        tx.run(LEPAS_JADWAL, kodes=lepas[i:i + chunk_size])
+
+    ditulis = 0
+    for i in range(0, len(rows), chunk_size):
+        mulai = time.perf_counter()
+        result = tx.run(TULIS_JADWAL, rows=rows[i:i + chunk_size])
+        baris = result.single()["ditulis"]
+        ditulis += baris
+        log.info("Sinkron chunk %d: %d baris, %.4f detik", i // chunk_size + 1, baris, time.perf_counter() - mulai)
+        if on_chunk is not None:
+            on_chunk(ditulis)
+
+    return {
+        "tambah": len(tambah),
+        "pindah": len(pindah),
+        "hapus": len(hapus),
+        "tetap": len(pewarnaan) - len(tambah) - len(pindah),
+        "ditulis": ditulis,
+    }
+
+
+def sync_pewarnaan(session, pewarnaan, slot_to_hari_jam, chunk_size=5000, on_chunk=None):
+    # pewarnaan = jadwal lengkap yang diinginkan (kode -> slot). Mengembalikan
+    # ringkasan baris yang berubah beserta waktunya. on_chunk(ditulis) dipanggil
+    # setelah tiap chunk relasi ditulis (untuk laporan progres); nilainya total
+    # baris di percobaan transaksi saat ini, bukan tambahan.
+    start = time.perf_counter()
+    ringkasan = session.execute_write(_sync_tx, pewarnaan, slot_to_hari_jam, chunk_size, on_chunk)
+    ringkasan["detik"] = time.perf_counter() - start
+    return ringkasan
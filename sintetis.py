@@ -0,0 +1,86 @@
+# === Generator data universitas sintetis (deterministik per seed) ===
+# Mahasiswa dan dosen dibagi ke fakultas; MK tiap fakultas dibagi ke semester
+# kurikulum. Tiap mahasiswa berada di satu semester dan mengambil beberapa MK,
+# sebagian besar dari semester itu dengan popularitas ala Zipf (MK wajib
+# diambil banyak orang), sisanya MK pilihan dari seluruh universitas. Tiap
+# dosen mengajar 1-3 MK di fakultasnya; tiap ruangan dipakai beberapa MK.
+# Hasilnya berbentuk sama dengan data di Neo4j sehingga bisa langsung dipakai
+# conflicts_from_incidence() dan CompactGraph.
+import random
+from itertools import accumulate
+
+PRESET = {
+    # Satu prodi: 8 semester x 10 MK, tiap mahasiswa 4-6 MK
+    "kecil": {"mahasiswa": 300, "mk": 80, "fakultas": 1, "mk_per_mahasiswa": (4, 6), "pilihan": 0.1},
+    "sedang": {"mahasiswa": 5000, "mk": 600, "fakultas": 4},
+    "besar": {"mahasiswa": 50000, "mk": 5000, "fakultas": 10},
+}
+
+
+def generate_university(mahasiswa, mk, fakultas=1, semester=8, dosen=None, mk_per_mahasiswa=(6, 9),
+                        pilihan=0.15, mk_per_ruangan=8, zipf=1.1, seed=42):
+    # Mengembalikan dict: courses [(kode, nama, ruangan)], users [(id, nama, role)],
+    # mengambil [(id_mahasiswa, kode)], mengajar [(id_dosen, kode)]
+    rnd = random.Random(seed)
+    dosen = dosen if dosen is not None else max(1, mk // 2)
+
+    kodes = [f"MK{i:05d}" for i in range(mk)]
+    per_fakultas = [kodes[f::fakultas] for f in range(fakultas)]
+    # Kelompok kurikulum (fakultas, semester); fakultas kecil bisa punya < `semester` kelompok
+    kelompok = []
+    for daftar in per_fakultas:
+        n_sem = max(1, min(semester, len(daftar) // 4))
+        kelompok.append([daftar[s::n_sem] for s in range(n_sem)])
+    jumlah_ruangan = max(1, -(-mk // mk_per_ruangan))
+    courses = [(kode, f"Mata Kuliah {i}", f"R{rnd.randrange(jumlah_ruangan):04d}") for i, kode in enumerate(kodes)]
+
+    # Bobot Zipf kumulatif, dipakai dengan rnd.choices(cum_weights=...)
+    def zipf_kumulatif(n):
+        return list(accumulate(1.0 / (r + 1) ** zipf for r in range(n)))
+
+    bobot = [[zipf_kumulatif(len(daftar)) for daftar in sem] for sem in kelompok]
+    bobot_semua = zipf_kumulatif(mk)
+
+    users = []
+    mengambil = []
+    for i in range(mahasiswa):
+        uid = f"M{i:06d}"
+        users.append((uid, f"Mahasiswa {i}", "Mahasiswa"))
+        f = i % fakultas
+        sem = rnd.randrange(len(kelompok[f]))
+        daftar, cum = kelompok[f][sem], bobot[f][sem]
+        # Tidak mengambil lebih banyak MK daripada yang ditawarkan semesternya
+        k = min(rnd.randint(*mk_per_mahasiswa), len(daftar))
+        diambil = set()
+        # Batas percobaan supaya fakultas kecil tidak membuat loop tak berujung
+        for _ in range(k * 4):
+            if len(diambil) >= k:
+                break
+            if rnd.random() < pilihan:
+                diambil.add(rnd.choices(kodes, cum_weights=bobot_semua)[0])
+            else:
+                diambil.add(rnd.choices(daftar, cum_weights=cum)[0])
+        mengambil.extend((uid, kode) for kode in sorted(diambil))
+
+    mengajar = []
+    belum = list(kodes)
+    rnd.shuffle(belum)
+    for i in range(dosen):
+        uid = f"D{i:05d}"
+        users.append((uid, f"Dosen {i}", "Dosen"))
+        f = i % fakultas
+        # MK yang belum punya pengajar didahulukan
+        ajar = {belum.pop()} if belum else set()
+        for _ in range(rnd.randint(0, 2)):
+            ajar.add(rnd.choice(per_fakultas[f]))
+        mengajar.extend((uid, kode) for kode in sorted(ajar))
+
+    return {"courses": courses, "users": users, "mengambil": mengambil, "mengajar": mengajar}
+
+
+def room_cliques(courses):
+    # Sama dengan read_room_cliques: MK per ruangan, hanya ruangan dengan > 1 MK
+    per_ruangan = {}
+    for kode, _, ruangan in courses:
+        per_ruangan.setdefault(ruangan, []).append(kode)
+    return [kodes for _, kodes in sorted(per_ruangan.items()) if len(kodes) > 1]
@@ -0,0 +1,101 @@
+# === Konflik dari ekspor insidensi + perkalian matriks sparse ===
+# Alternatif read-only untuk relasi BERTABRAKAN_*: daftar (mahasiswa, kode) dan
+# (dosen, kode) ditarik dengan satu query masing-masing, lalu adjacency
+# mata kuliah dihitung sebagai AᵀA. Nilai di luar diagonal = jumlah orang yang
+# sama-sama ada di kedua mata kuliah. Database tidak ditulis sama sekali.
+from collections import Counter
+from itertools import combinations
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # fallback pure-Python, lebih lambat
+    np = None
+    sparse = None
+
+
+INSIDENSI_MAHASISWA = """
+    MATCH (m:User {role:'Mahasiswa'})-[:MENGAMBIL]->(c:MataKuliah)
+    RETURN m.id AS orang, c.kode AS kode
+"""
+
+INSIDENSI_DOSEN = """
+    MATCH (d:User {role:'Dosen'})-[:MENGAJAR]->(c:MataKuliah)
+    RETURN d.id AS orang, c.kode AS kode
+"""
+
+
+def _fetch_incidence_tx(tx):
+    mahasiswa = [(r["orang"], r["kode"]) for r in tx.run(INSIDENSI_MAHASISWA)]
+    dosen = [(r["orang"], r["kode"]) for r in tx.run(INSIDENSI_DOSEN)]
+    return mahasiswa, dosen
+
+
+def fetch_incidence(session):
+    return session.execute_read(_fetch_incidence_tx)
+
+
+def _pair_counts_sparse(pairs, index):
+    orang = {}
+    rows, cols = [], []
+    for p, kode in pairs:
+        rows.append(orang.setdefault(p, len(orang)))
+        cols.append(index[kode])
+    A = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(orang), len(index)),
+    )
+    # Relasi ganda orang-kode dihitung sekali
+    A.data[:] = 1
+    C = sparse.triu(A.T.tocsr() @ A, k=1).tocoo()
+    return {(int(i), int(j)): int(w) for i, j, w in zip(C.row, C.col, C.data)}
+
+
+def _pair_counts_python(pairs, index):
+    per_orang = {}
+    for p, kode in pairs:
+        per_orang.setdefault(p, set()).add(index[kode])
+    counts = Counter()
+    for kodes in per_orang.values():
+        counts.update(combinations(sorted(kodes), 2))
+    return dict(counts)
+
+
+def pair_counts(pairs, index):
+    # {(i, j): jumlah orang bersama} untuk i < j, i/j = id mata kuliah di `index`
+    if sparse is not None:
+        return _pair_counts_sparse(pairs, index)
+    return _pair_counts_python(pairs, index)
+
+
+def conflicts_from_incidence(mahasiswa, dosen):
+    # Mengembalikan list (mk1, mk2, jumlah_mahasiswa, jumlah_dosen) dengan mk1 < mk2
+    kodes = sorted({k for _, k in mahasiswa} | {k for _, k in dosen})
+    index = {k: i for i, k in enumerate(kodes)}
+    bobot_mhs = pair_counts(mahasiswa, index)
+    bobot_dosen = pair_counts(dosen, index)
+    hasil = []
+    for i, j in sorted(bobot_mhs.keys() | bobot_dosen.keys()):
+        hasil.append((kodes[i], kodes[j], bobot_mhs.get((i, j), 0), bobot_dosen.get((i, j), 0)))
+    return hasil
+
+
+def build_sparse_conflicts(session):
+    mahasiswa, dosen = fetch_incidence(session)
+    return conflicts_from_incidence(mahasiswa, dosen)
+
+
+if __name__ == "__main__":
+    # python sparse_conflicts.py -> ringkasan konflik tanpa menulis ke Neo4j
+    import time
+    from neo4j import GraphDatabase
+
+    driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "admin123"))
+    with driver.session(database="grafcoloring") as session:
+        start = time.perf_counter()
+        konflik = build_sparse_conflicts(session)
+        durasi = time.perf_counter() - start
+    driver.close()
+    print(f"Jumlah konflik: {len(konflik)} ({durasi:.4f} detik)")
+    for mk1, mk2, mhs, dsn in sorted(konflik, key=lambda e: -e[2])[:20]:
+        print(f"  {mk1} - {mk2}: {mhs} mahasiswa, {dsn} dosen")
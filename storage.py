@@ -0,0 +1,506 @@
+# === Lapisan penyimpanan: antarmuka repository + implementasi Neo4j / memori ===
+# app.py hanya berbicara dengan Repository, sehingga pipeline (graf konflik,
+# pewarnaan, sinkronisasi, CRUD MK) bisa dijalankan tanpa Neo4j:
+#   GRAFCOLORING_STORAGE=neo4j   (default) bolt://localhost:7687, database grafcoloring
+#   GRAFCOLORING_STORAGE=memory  data dari GRAFCOLORING_SNAPSHOT (JSON hasil
+#                                `python storage.py export`) atau universitas
+#                                sintetis GRAFCOLORING_PRESET/GRAFCOLORING_SEED
+import json
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from conflicts import (bump_version, clear_changed_courses, data_version, read_changed_courses, read_conflicts,
+                       read_course_codes, read_course_rooms, read_room_cliques, refresh_conflicts)
+from metrics import TimedSession
+from sintetis import PRESET, generate_university
+from sinkron import diff_schedule, read_schedule, sync_pewarnaan
+from sparse_conflicts import build_sparse_conflicts, conflicts_from_incidence
+
+
+# Query CRUD Neo4jRepository; ikut di-PROFILE oleh schema.py
+BACA_USER = "MATCH (u:User {id:$id}) RETURN u.id AS id, u.nama AS nama, u.role AS role"
+DAFTAR_MK = "MATCH (c:MataKuliah) RETURN c.kode AS kode, c.nama AS nama, c.ruangan AS ruangan"
+BACA_MK = "MATCH (c:MataKuliah {kode:$k}) RETURN c.kode AS kode, c.nama AS nama, c.ruangan AS ruangan"
+TAMBAH_MK = "CREATE (:MataKuliah {kode:$k, nama:$n, ruangan:$r})"
+UBAH_MK = "MATCH (c:MataKuliah {kode:$k}) SET c.nama=$n, c.ruangan=$r"
+HAPUS_MK = "MATCH (c:MataKuliah {kode:$k}) DETACH DELETE c"
+INFO_JADWAL = """
+    MATCH (c:MataKuliah)-[:DIJADWALKAN]->(j:Jadwal)
+    RETURN c.kode AS kode, j.hari AS hari,
+           j.jam_mulai AS jam_mulai, j.jam_selesai AS jam_selesai,
+           j.slot AS slot, c.ruangan AS ruangan
+"""
+# Peserta MK: mahasiswa MENGAMBIL, dosen MENGAJAR (tipe relasi tidak bisa
+# jadi parameter Cypher, jadi satu query per relasi)
+RELASI_PERAN = {"Mahasiswa": "MENGAMBIL", "Dosen": "MENGAJAR"}
+TAMBAH_MENGAMBIL = """
+    MATCH (u:User {id:$id}), (c:MataKuliah {kode:$k})
+    MERGE (u)-[:MENGAMBIL]->(c)
+    RETURN count(c) AS n
+"""
+TAMBAH_MENGAJAR = """
+    MATCH (u:User {id:$id}), (c:MataKuliah {kode:$k})
+    MERGE (u)-[:MENGAJAR]->(c)
+    RETURN count(c) AS n
+"""
+HAPUS_MENGAMBIL = """
+    MATCH (:User {id:$id})-[r:MENGAMBIL]->(:MataKuliah {kode:$k})
+    DELETE r
+    RETURN count(r) AS n
+"""
+HAPUS_MENGAJAR = """
+    MATCH (:User {id:$id})-[r:MENGAJAR]->(:MataKuliah {kode:$k})
+    DELETE r
+    RETURN count(r) AS n
+"""
+TAMBAH_PESERTA = {"MENGAMBIL": TAMBAH_MENGAMBIL, "MENGAJAR": TAMBAH_MENGAJAR}
+HAPUS_PESERTA = {"MENGAMBIL": HAPUS_MENGAMBIL, "MENGAJAR": HAPUS_MENGAJAR}
+
+
+class Repository(ABC):
+    # Semua MK/user dikembalikan sebagai dict biasa: {"kode", "nama", "ruangan"}
+    # dan {"id", "nama", "role"}.
+
+    def ensure_schema(self):
+        pass
+
+    # --- User ---
+    @abstractmethod
+    def get_user(self, user_id):
+        raise NotImplementedError
+
+    # --- Mata kuliah ---
+    @abstractmethod
+    def list_courses(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_course(self, kode):
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_course(self, kode, nama, ruangan):
+        # False bila kode sudah ada
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_course(self, kode, nama, ruangan):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_course(self, kode):
+        raise NotImplementedError
+
+    # --- Peserta MK (MENGAMBIL/MENGAJAR menurut role user) ---
+    @abstractmethod
+    def add_enrollment(self, user_id, kode):
+        # False bila user/MK tidak ada atau role-nya bukan Mahasiswa/Dosen
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_enrollment(self, user_id, kode):
+        # False bila relasinya memang tidak ada
+        raise NotImplementedError
+
+    # --- Masukan graf konflik ---
+    @abstractmethod
+    def data_version(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def course_codes(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def conflicts(self, source="edges"):
+        # List (mk1, mk2) bentrok mahasiswa/dosen
+        raise NotImplementedError
+
+    @abstractmethod
+    def room_cliques(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def course_rooms(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def changed_courses(self):
+        # kode -> versi data, untuk MK yang bentroknya berubah sejak sinkron terakhir
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_changed(self, berubah):
+        # Hapus penanda hasil changed_courses() yang versinya belum berubah
+        raise NotImplementedError
+
+    # --- Jadwal ---
+    @abstractmethod
+    def read_schedule(self):
+        # kode -> slot
+        raise NotImplementedError
+
+    @abstractmethod
+    def schedule_info(self):
+        # slot -> [{"kode", "hari", "jam_mulai", "jam_selesai", "ruangan"}]
+        raise NotImplementedError
+
+    @abstractmethod
+    def sync_schedule(self, pewarnaan, slot_to_hari_jam, on_chunk=None):
+        # Ringkasan seperti sinkron.sync_pewarnaan
+        raise NotImplementedError
+
+
+class Neo4jRepository(Repository):
+    def __init__(self, uri="bolt://localhost:7687", auth=("neo4j", "admin123"), database="grafcoloring"):
+        # Driver hanya diimpor di sini: mode memory tidak butuh paket neo4j
+        from neo4j import GraphDatabase
+
+        self.driver = GraphDatabase.driver(uri, auth=auth)
+        self.database = database
+
+    def session(self):
+        # Setiap query/transaksi tercatat di /metrics
+        return TimedSession(self.driver.session(database=self.database))
+
+    def ensure_schema(self):
+        # schema.py mengimpor konstanta query dari modul ini
+        from schema import ensure_schema
+
+        with self.session() as s:
+            ensure_schema(s)
+
+    def get_user(self, user_id):
+        with self.session() as s:
+            r = s.run(BACA_USER, id=user_id).single()
+        return dict(id=r["id"], nama=r["nama"], role=r["role"]) if r else None
+
+    def list_courses(self):
+        with self.session() as s:
+            rows = s.run(DAFTAR_MK)
+            return [dict(kode=r["kode"], nama=r["nama"], ruangan=r["ruangan"]) for r in rows]
+
+    def get_course(self, kode):
+        with self.session() as s:
+            r = s.run(BACA_MK, k=kode).single()
+        return dict(kode=r["kode"], nama=r["nama"], ruangan=r["ruangan"]) if r else None
+
+    def add_course(self, kode, nama, ruangan):
+        from neo4j.exceptions import ConstraintError
+        with self.session() as s:
+            try:
+                s.run(TAMBAH_MK, k=kode, n=nama, r=ruangan).consume()
+            except ConstraintError:
+                # Constraint unik dari schema.py
+                return False
+            refresh_conflicts(s, [kode])
+        return True
+
+    def update_course(self, kode, nama, ruangan):
+        with self.session() as s:
+            s.run(UBAH_MK, k=kode, n=nama, r=ruangan)
+            refresh_conflicts(s, [kode])
+
+    def delete_course(self, kode):
+        with self.session() as s:
+            s.run(HAPUS_MK, k=kode)
+            bump_version(s)
+
+    def add_enrollment(self, user_id, kode):
+        user = self.get_user(user_id)
+        relasi = RELASI_PERAN.get(user["role"]) if user else None
+        if relasi is None:
+            return False
+        with self.session() as s:
+            if not s.run(TAMBAH_PESERTA[relasi], id=user_id, k=kode).single()["n"]:
+                return False
+            refresh_conflicts(s, [kode])
+        return True
+
+    def remove_enrollment(self, user_id, kode):
+        user = self.get_user(user_id)
+        relasi = RELASI_PERAN.get(user["role"]) if user else None
+        if relasi is None:
+            return False
+        with self.session() as s:
+            if not s.run(HAPUS_PESERTA[relasi], id=user_id, k=kode).single()["n"]:
+                return False
+            refresh_conflicts(s, [kode])
+        return True
+
+    def data_version(self):
+        with self.session() as s:
+            return data_version(s)
+
+    def course_codes(self):
+        with self.session() as s:
+            return read_course_codes(s)
+
+    def conflicts(self, source="edges"):
+        # source="sparse": bentrok dihitung langsung dari MENGAMBIL/MENGAJAR
+        # (AᵀA), tanpa bergantung pada relasi BERTABRAKAN_* yang tersimpan
+        with self.session() as s:
+            if source == "sparse":
+                return [(mk1, mk2) for mk1, mk2, _, _ in build_sparse_conflicts(s)]
+            return read_conflicts(s)
+
+    def room_cliques(self):
+        with self.session() as s:
+            return read_room_cliques(s)
+
+    def course_rooms(self):
+        with self.session() as s:
+            return read_course_rooms(s)
+
+    def changed_courses(self):
+        with self.session() as s:
+            return read_changed_courses(s)
+
+    def clear_changed(self, berubah):
+        with self.session() as s:
+            clear_changed_courses(s, berubah)
+
+    def read_schedule(self):
+        with self.session() as s:
+            return read_schedule(s)
+
+    def schedule_info(self):
+        data = defaultdict(list)
+        with self.session() as s:
+            result = s.run(INFO_JADWAL)
+            for r in result:
+                data[int(r["slot"])].append({
+                    "kode": r["kode"],
+                    "hari": r["hari"],
+                    "jam_mulai": r["jam_mulai"],
+                    "jam_selesai": r["jam_selesai"],
+                    "ruangan": r["ruangan"]
+                })
+        return data
+
+    def sync_schedule(self, pewarnaan, slot_to_hari_jam, on_chunk=None):
+        with self.session() as s:
+            return sync_pewarnaan(s, pewarnaan, slot_to_hari_jam, on_chunk=on_chunk)
+
+    def export_data(self):
+        # Snapshot berbentuk sama dengan sintetis.generate_university, ditambah
+        # jadwal (kode -> slot) dan slot (slot -> [hari, jam_mulai, jam_selesai])
+        with self.session() as s:
+            courses = [(r["kode"], r["nama"], r["ruangan"]) for r in s.run(
+                "MATCH (c:MataKuliah) RETURN c.kode AS kode, c.nama AS nama, c.ruangan AS ruangan ORDER BY kode")]
+            users = [(r["id"], r["nama"], r["role"]) for r in s.run(
+                "MATCH (u:User) RETURN u.id AS id, u.nama AS nama, u.role AS role ORDER BY id")]
+            mengambil = [(r["orang"], r["kode"]) for r in s.run(
+                "MATCH (m:User)-[:MENGAMBIL]->(c:MataKuliah) RETURN m.id AS orang, c.kode AS kode")]
+            mengajar = [(r["orang"], r["kode"]) for r in s.run(
+                "MATCH (d:User)-[:MENGAJAR]->(c:MataKuliah) RETURN d.id AS orang, c.kode AS kode")]
+            slot = {r["slot"]: [r["hari"], r["jam_mulai"], r["jam_selesai"]] for r in s.run(
+                "MATCH (j:Jadwal) RETURN j.slot AS slot, j.hari AS hari, j.jam_mulai AS jam_mulai, j.jam_selesai AS jam_selesai")}
+        return {"courses": courses, "users": users, "mengambil": mengambil, "mengajar": mengajar,
+                "jadwal": self.read_schedule(), "slot": slot}
+
+
+class MemoryRepository(Repository):
+    # Seluruh data di dict Python. Konflik mahasiswa/dosen dihitung dari
+    # insidensi (sama dengan CONFLICT_SOURCE="sparse") dan di-cache per versi.
+    def __init__(self, data):
+        self._lock = threading.Lock()
+        self.courses = {kode: {"kode": kode, "nama": nama, "ruangan": ruangan}
+                        for kode, nama, ruangan in data["courses"]}
+        self.users = {uid: {"id": uid, "nama": nama, "role": role} for uid, nama, role in data["users"]}
+        self.mengambil = [tuple(x) for x in data["mengambil"]]
+        self.mengajar = [tuple(x) for x in data["mengajar"]]
+        self.jadwal = {kode: int(slot) for kode, slot in data.get("jadwal", {}).items()}
+        self.slot_info = {int(slot): tuple(info) for slot, info in data.get("slot", {}).items()}
+        self.versi = 1
+        # kode -> versi saat bentroknya berubah (lihat conflicts.TANDAI_BERUBAH)
+        self.berubah = {}
+        self._konflik = (None, None)
+
+    @classmethod
+    def from_snapshot(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_synthetic(cls, preset="kecil", seed=42):
+        data = generate_university(seed=seed, **PRESET[preset])
+        # Akun admin supaya halaman kelola MK dan sinkronisasi bisa dicoba
+        data["users"].append(("admin", "Admin", "Admin"))
+        return cls(data)
+
+    def _ubah(self, *kodes):
+        # Naikkan versi; `kodes` = MK yang bentroknya berubah
+        self.versi += 1
+        for kode in kodes:
+            self.berubah[kode] = self.versi
+
+    def get_user(self, user_id):
+        user = self.users.get(user_id)
+        return dict(user) if user else None
+
+    def list_courses(self):
+        with self._lock:
+            return [dict(c) for c in self.courses.values()]
+
+    def get_course(self, kode):
+        with self._lock:
+            c = self.courses.get(kode)
+            return dict(c) if c else None
+
+    def add_course(self, kode, nama, ruangan):
+        with self._lock:
+            if kode in self.courses:
+                return False
+            self.courses[kode] = {"kode": kode, "nama": nama, "ruangan": ruangan}
+            self._ubah(kode)
+        return True
+
+    def update_course(self, kode, nama, ruangan):
+        with self._lock:
+            if kode in self.courses:
+                self.courses[kode].update(nama=nama, ruangan=ruangan)
+                self._ubah(kode)
+
+    def delete_course(self, kode):
+        with self._lock:
+            if self.courses.pop(kode, None) is None:
+                return
+            self.mengambil = [x for x in self.mengambil if x[1] != kode]
+            self.mengajar = [x for x in self.mengajar if x[1] != kode]
+            self.jadwal.pop(kode, None)
+            self.berubah.pop(kode, None)
+            self._ubah()
+
+    def _daftar_peserta(self, user_id):
+        user = self.users.get(user_id)
+        relasi = RELASI_PERAN.get(user["role"]) if user else None
+        return {"MENGAMBIL": self.mengambil, "MENGAJAR": self.mengajar}.get(relasi)
+
+    def add_enrollment(self, user_id, kode):
+        with self._lock:
+            daftar = self._daftar_peserta(user_id)
+            if daftar is None or kode not in self.courses:
+                return False
+            if (user_id, kode) not in daftar:
+                daftar.append((user_id, kode))
+                self._ubah(kode)
+        return True
+
+    def remove_enrollment(self, user_id, kode):
+        with self._lock:
+            daftar = self._daftar_peserta(user_id)
+            if daftar is None or (user_id, kode) not in daftar:
+                return False
+            daftar.remove((user_id, kode))
+            self._ubah(kode)
+        return True
+
+    def data_version(self):
+        return self.versi
+
+    def course_codes(self):
+        with self._lock:
+            return sorted(self.courses)
+
+    def conflicts(self, source="edges"):
+        with self._lock:
+            versi, hasil = self._konflik
+            if versi != self.versi:
+                hasil = [(mk1, mk2) for mk1, mk2, _, _ in conflicts_from_incidence(self.mengambil, self.mengajar)
+                         if mk1 in self.courses and mk2 in self.courses]
+                self._konflik = (self.versi, hasil)
+            return list(hasil)
+
+    def room_cliques(self):
+        with self._lock:
+            per_ruangan = defaultdict(list)
+            for c in self.courses.values():
+                if c["ruangan"] is not None:
+                    per_ruangan[c["ruangan"]].append(c["kode"])
+            return [kodes for _, kodes in sorted(per_ruangan.items()) if len(kodes) > 1]
+
+    def course_rooms(self):
+        with self._lock:
+            return {kode: c["ruangan"] for kode, c in self.courses.items()}
+
+    def changed_courses(self):
+        with self._lock:
+            return dict(self.berubah)
+
+    def clear_changed(self, berubah):
+        with self._lock:
+            for kode, versi in berubah.items():
+                if self.berubah.get(kode) == versi:
+                    del self.berubah[kode]
+
+    def read_schedule(self):
+        with self._lock:
+            return dict(self.jadwal)
+
+    def schedule_info(self):
+        data = defaultdict(list)
+        with self._lock:
+            for kode, slot in self.jadwal.items():
+                hari, jam_mulai, jam_selesai = self.slot_info.get(slot, (None, None, None))
+                data[slot].append({
+                    "kode": kode,
+                    "hari": hari,
+                    "jam_mulai": jam_mulai,
+                    "jam_selesai": jam_selesai,
+                    "ruangan": self.courses[kode]["ruangan"],
+                })
+        return data
+
+    def sync_schedule(self, pewarnaan, slot_to_hari_jam, on_chunk=None):
+        start = time.perf_counter()
+        with self._lock:
+            baru = {kode: slot for kode, slot in pewarnaan.items() if kode in self.courses}
+            tambah, pindah, hapus = diff_schedule(self.jadwal, baru)
+            for row in tambah + pindah:
+                self.jadwal[row["kode"]] = row["slot"]
+            # Sama dengan sinkron._sync_tx: hari/jam semua slot terpakai diperbarui
+            for slot in set(baru.values()):
+                self.slot_info[slot] = tuple(slot_to_hari_jam(slot))
+            for kode in hapus:
+                del self.jadwal[kode]
+        ditulis = len(tambah) + len(pindah)
+        if on_chunk is not None:
+            on_chunk(ditulis)
+        return {
+            "tambah": len(tambah),
+            "pindah": len(pindah),
+            "hapus": len(hapus),
+            "tetap": len(baru) - ditulis,
+            "ditulis": ditulis,
+            "detik": time.perf_counter() - start,
+        }
+
+
+def create_repository(environ=os.environ):
+    jenis = environ.get("GRAFCOLORING_STORAGE", "neo4j")
+    if jenis == "neo4j":
+        return Neo4jRepository()
+    if jenis == "memory":
+        snapshot = environ.get("GRAFCOLORING_SNAPSHOT")
+        if snapshot:
+            return MemoryRepository.from_snapshot(snapshot)
+        return MemoryRepository.from_synthetic(environ.get("GRAFCOLORING_PRESET", "kecil"),
+                                               int(environ.get("GRAFCOLORING_SEED", "42")))
+    raise ValueError(f"GRAFCOLORING_STORAGE tidak dikenal: {jenis}")
+
+
+if __name__ == "__main__":
+    # python storage.py export snapshot.json -> salin data Neo4j untuk mode memory
+    if len(sys.argv) != 3 or sys.argv[1] != "export":
+        sys.exit("Pemakaian: python storage.py export <file.json>")
+    repo = Neo4jRepository()
+    data = repo.export_data()
+    repo.driver.close()
+    with open(sys.argv[2], "w") as f:
+        json.dump(data, f)
+    print(f"{len(data['courses'])} MK, {len(data['users'])} user, {len(data['mengambil'])} MENGAMBIL -> {sys.argv[2]}")
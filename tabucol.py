@@ -0,0 +1,123 @@
+# === Tabucol: pengurangan jumlah slot dengan tabu search ===
+# Mengambil pewarnaan yang sudah ada lalu berulang kali mencoba k-1 warna.
+# gamma[v][c] = jumlah tetangga v yang berwarna c, sehingga delta konflik
+# untuk memindahkan v ke warna c cukup gamma[v][c] - gamma[v][warna(v)] (O(1)).
+import random
+import time
+
+from coloring import jumlah_warna
+from compact_graph import as_compact
+
+
+def _rapatkan(colors):
+    # Warna yang tidak terpakai dibuang, urutan warna dipertahankan
+    peta = {c: i for i, c in enumerate(sorted(set(colors)))}
+    return [peta[c] for c in colors]
+
+
+def tabucol(adj, colors, k, max_iter=100000, deadline=None, seed=0):
+    # Mengembalikan pewarnaan k warna tanpa konflik, atau None bila gagal
+    rnd = random.Random(seed)
+    n = len(adj)
+    if k < 2:
+        # Tanpa warna alternatif tabu search tidak bisa bergerak
+        return [0] * n if k == 1 and not any(adj) else None
+    col = list(colors)
+
+    # Simpul dengan warna >= k dipindah ke warna dengan konflik paling sedikit
+    for v in range(n):
+        if col[v] >= k:
+            hitung = [0] * k
+            for u in adj[v]:
+                if col[u] < k:
+                    hitung[col[u]] += 1
+            col[v] = min(range(k), key=hitung.__getitem__)
+
+    gamma = [[0] * k for _ in range(n)]
+    for v in range(n):
+        for u in adj[v]:
+            gamma[v][col[u]] += 1
+    f = sum(gamma[v][col[v]] for v in range(n)) // 2
+    konflik = {v for v in range(n) if gamma[v][col[v]] > 0}
+    tabu = [[0] * k for _ in range(n)]
+    best_f = f
+
+    for it in range(max_iter):
+        if f == 0:
+            return col
+        if deadline is not None and it % 64 == 0 and time.perf_counter() > deadline:
+            return None
+
+        best_delta = None
+        moves = []
+        for v in konflik:
+            gv = gamma[v]
+            base = gv[col[v]]
+            tv = tabu[v]
+            for c in range(k):
+                if c == col[v]:
+                    continue
+                delta = gv[c] - base
+                if best_delta is not None and delta > best_delta:
+                    continue
+                # Langkah tabu hanya boleh bila menghasilkan rekor baru (aspirasi)
+                if tv[c] > it and f + delta >= best_f:
+                    continue
+                if best_delta is None or delta < best_delta:
+                    best_delta = delta
+                    moves = [(v, c)]
+                else:
+                    moves.append((v, c))
+
+        if moves:
+            v, c = rnd.choice(moves)
+        else:
+            # Semua langkah tabu: ambil langkah acak di simpul konflik
+            v = rnd.choice(sorted(konflik))
+            c = rnd.choice([w for w in range(k) if w != col[v]])
+            best_delta = gamma[v][c] - gamma[v][col[v]]
+
+        lama = col[v]
+        col[v] = c
+        tabu[v][lama] = it + int(0.6 * len(konflik)) + rnd.randrange(10)
+        for u in adj[v]:
+            gu = gamma[u]
+            gu[lama] -= 1
+            gu[c] += 1
+            if gu[col[u]] > 0:
+                konflik.add(u)
+            else:
+                konflik.discard(u)
+        if gamma[v][c] > 0:
+            konflik.add(v)
+        else:
+            konflik.discard(v)
+        f += best_delta
+        best_f = min(best_f, f)
+
+    return col if f == 0 else None
+
+
+def improve_coloring(G, coloring, target_k=None, time_limit=1.0, max_iter=100000, seed=0, lower_bound=None):
+    # Turunkan jumlah slot satu per satu sampai gagal, waktu habis, target_k
+    # (mis. 5 hari kerja) tercapai, atau k-1 di bawah lower_bound (mis. klik
+    # terbesar, lihat reduksi.clique_lower_bound). Mengembalikan (coloring, info).
+    start = time.perf_counter()
+    deadline = start + time_limit
+    g = as_compact(G)
+    best = _rapatkan([coloring[node] for node in g.nodes]) if len(g) else []
+    awal = jumlah_warna(coloring)
+    k = max(best) + 1 if best else 0
+    # Pewarnaan 1 warna tidak dicari: graf dengan edge butuh minimal 2
+    batas = max(target_k or 1, lower_bound or 1, 2)
+    adj = g.expanded_adjacency() if k > batas else None
+
+    while k > batas and time.perf_counter() < deadline:
+        hasil = tabucol(adj, best, k - 1, max_iter, deadline, seed)
+        if hasil is None:
+            break
+        best = _rapatkan(hasil)
+        k = max(best) + 1
+
+    info = {"awal": awal, "akhir": k, "lower": lower_bound, "detik": time.perf_counter() - start}
+    return g.to_mapping(best), info
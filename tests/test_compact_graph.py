@@ -0,0 +1,40 @@
+import random
+from itertools import combinations
+
+from coloring import dsatur, welsh_powell
+from compact_graph import CompactGraph
+
+
+def graf_acak(seed, n=30, m=60, ruangan=5):
+    rnd = random.Random(seed)
+    kodes = [f"MK{i:02d}" for i in range(n)]
+    edges = [tuple(rnd.sample(kodes, 2)) for _ in range(m)]
+    per_ruangan = {}
+    for kode in kodes:
+        per_ruangan.setdefault(rnd.randrange(ruangan), []).append(kode)
+    return kodes, edges, list(per_ruangan.values())
+
+
+def materialisasi(G):
+    # Graf setara tanpa klik: semua pasangan anggota klik jadi edge biasa
+    edges = [(G.nodes[u], G.nodes[v]) for u, v in G.edges()]
+    for q in G.cliques:
+        edges.extend((G.nodes[u], G.nodes[v]) for u, v in combinations(q, 2))
+    return CompactGraph.from_edges(edges, nodes=G.nodes)
+
+
+def test_pasangan_edge_dan_klik_dihitung_sekali():
+    G = CompactGraph.from_edges([("A", "B")], cliques=[["A", "B"]])
+    assert G.degrees() == [1, 1]
+    assert G.number_of_conflicts() == 1
+
+
+def test_derajat_dan_konflik_sama_dengan_graf_termaterialisasi():
+    for seed in range(50):
+        kodes, edges, cliques = graf_acak(seed)
+        G = CompactGraph.from_edges(edges, nodes=kodes, cliques=cliques)
+        M = materialisasi(G)
+        assert G.degrees() == M.degrees()
+        assert G.number_of_conflicts() == M.number_of_edges()
+        assert welsh_powell(G) == welsh_powell(M)
+        assert dsatur(G) == dsatur(M)
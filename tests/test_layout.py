@@ -0,0 +1,22 @@
+import os
+
+from compact_graph import CompactGraph
+from layout import layout_graph, load_positions
+
+
+def _graf():
+    return CompactGraph.from_edges([("A", "B"), ("B", "C")], nodes=["A", "B", "C", "D"])
+
+
+def test_posisi_disimpan_tanpa_file_sementara(tmp_path):
+    path = str(tmp_path / "layout.json")
+    pos = layout_graph(_graf(), path=path)
+    assert load_positions(path) == pos
+    assert os.listdir(tmp_path) == ["layout.json"]
+
+
+def test_gagal_simpan_tetap_mengembalikan_posisi(tmp_path):
+    # Direktori tidak ada: penulisan gagal, posisi di memori tetap dipakai
+    path = str(tmp_path / "tidak-ada" / "layout.json")
+    pos = layout_graph(_graf(), path=path)
+    assert set(pos) == {"A", "B", "C", "D"}
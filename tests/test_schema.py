@@ -0,0 +1,38 @@
+import schema
+
+
+class _Hasil(list):
+    def single(self):
+        return self[0]
+
+    def consume(self):
+        return None
+
+
+class _Session:
+    # Session palsu: MataKuliah.kode punya nilai ganda, label lain bersih
+    def __init__(self, ada=()):
+        self.ada = list(ada)
+        self.dijalankan = []
+
+    def run(self, query):
+        self.dijalankan.append(query)
+        if query.startswith("SHOW CONSTRAINTS"):
+            return _Hasil([{"nama": self.ada}])
+        if "WITH n.kode AS nilai" in query and "(n:MataKuliah)" in query:
+            return _Hasil([{"nilai": "IF101", "jumlah": 2}])
+        return _Hasil()
+
+
+def test_constraint_dengan_nilai_ganda_dilewati(caplog):
+    s = _Session()
+    assert schema.ensure_schema(s) == {"matakuliah_kode": [("IF101", 2)]}
+    dibuat = [q for q in s.dijalankan if q.startswith("CREATE CONSTRAINT")]
+    assert [q.split()[2] for q in dibuat] == ["user_id", "jadwal_slot", "meta_nama"]
+    assert "IF101" in caplog.text
+
+
+def test_constraint_yang_sudah_ada_tidak_dicek_ulang():
+    s = _Session(ada=[nama for nama, _, _ in schema.UNIK])
+    assert schema.ensure_schema(s) == {}
+    assert not any("count(*)" in q for q in s.dijalankan)
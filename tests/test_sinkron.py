@@ -0,0 +1,39 @@
+from sinkron import BACA_JADWAL, TULIS_JADWAL, TULIS_SLOT, _sync_tx
+
+
+class _Hasil(list):
+    def single(self):
+        return self[0]
+
+
+class _Tx:
+    # Transaksi palsu: mencatat query dan mengembalikan jadwal tersimpan
+    def __init__(self, jadwal):
+        self.jadwal = jadwal
+        self.dijalankan = []
+
+    def run(self, query, **params):
+        self.dijalankan.append((query, params))
+        if query == BACA_JADWAL:
+            return _Hasil({"kode": k, "slot": s} for k, s in self.jadwal.items())
+        if query == TULIS_JADWAL:
+            return _Hasil([{"ditulis": len(params["rows"])}])
+        return _Hasil()
+
+
+def test_slot_lama_ditulis_ulang_walau_jadwal_tetap():
+    tx = _Tx({"A": 0, "B": 4, "C": 5})
+    hasil = _sync_tx(tx, {"A": 0, "B": 4, "C": 5}, lambda slot: ("H", str(slot), str(slot)), 5000, None)
+    assert hasil["ditulis"] == 0
+    slots = [params["slots"] for query, params in tx.dijalankan if query == TULIS_SLOT]
+    assert slots == [[{"slot": s, "hari": "H", "jam_mulai": str(s), "jam_selesai": str(s)} for s in (0, 4, 5)]]
+
+
+def test_progres_dan_log_per_chunk(caplog):
+    caplog.set_level("INFO", logger="sinkron")
+    progres = []
+    tx = _Tx({})
+    hasil = _sync_tx(tx, {"A": 0, "B": 1, "C": 2}, lambda slot: ("H", "", ""), 2, progres.append)
+    assert hasil["ditulis"] == 3
+    assert progres == [0, 2, 3]
+    assert [r.getMessage().split(":")[0] for r in caplog.records] == ["Sinkron chunk 1", "Sinkron chunk 2"]
@@ -0,0 +1,69 @@
+import pytest
+
+from storage import MemoryRepository, Repository
+
+
+def _repo():
+    return MemoryRepository({
+        "courses": [("A", "MK A", "R1"), ("B", "MK B", "R2"), ("C", "MK C", "R3")],
+        "users": [("m1", "Mhs", "Mahasiswa"), ("d1", "Dosen", "Dosen"), ("admin", "Admin", "Admin")],
+        "mengambil": [("m1", "A")],
+        "mengajar": [("d1", "C")],
+    })
+
+
+def test_repository_abstrak():
+    with pytest.raises(TypeError):
+        Repository()
+
+
+def test_tambah_hapus_peserta_memperbarui_konflik():
+    repo = _repo()
+    assert repo.conflicts() == []
+    versi = repo.data_version()
+
+    assert repo.add_enrollment("m1", "B")
+    assert repo.conflicts() == [("A", "B")]
+    assert repo.add_enrollment("d1", "A")
+    assert sorted(repo.conflicts()) == [("A", "B"), ("A", "C")]
+    assert repo.data_version() > versi
+
+    versi = repo.data_version()
+    assert repo.remove_enrollment("m1", "B")
+    assert repo.conflicts() == [("A", "C")]
+    assert repo.data_version() > versi
+
+
+def test_peserta_tidak_valid():
+    repo = _repo()
+    versi = repo.data_version()
+    assert not repo.add_enrollment("admin", "A")
+    assert not repo.add_enrollment("m1", "X")
+    assert not repo.add_enrollment("x", "A")
+    assert not repo.remove_enrollment("m1", "C")
+    assert repo.data_version() == versi
+
+
+def test_sinkron_memperbaiki_slot_info_lama():
+    # Pemetaan slot lama menaruh slot >= 4 di Jumat 08:00; jadwal tidak berubah
+    repo = _repo()
+    repo.jadwal = {"A": 0, "B": 4, "C": 5}
+    repo.slot_info = {0: ("Senin", "08:00", "09:40"), 4: ("Jumat", "08:00", "09:40"),
+                      5: ("Jumat", "08:00", "09:40")}
+    hasil = repo.sync_schedule({"A": 0, "B": 4, "C": 5}, lambda slot: ("H", str(slot), str(slot)))
+    assert hasil["ditulis"] == 0
+    assert repo.slot_info == {0: ("H", "0", "0"), 4: ("H", "4", "4"), 5: ("H", "5", "5")}
+
+
+def test_penanda_berubah_hanya_dihapus_bila_versinya_sama():
+    repo = _repo()
+    assert repo.changed_courses() == {}
+    repo.add_enrollment("m1", "B")
+    repo.update_course("C", "MK C", "R9")
+    berubah = repo.changed_courses()
+    assert set(berubah) == {"B", "C"}
+
+    # C berubah lagi setelah penanda dibaca: penandanya harus bertahan
+    repo.update_course("C", "MK C", "R8")
+    repo.clear_changed(berubah)
+    assert set(repo.changed_courses()) == {"C"}
@@ -0,0 +1,40 @@
+from itertools import combinations
+
+import tabucol
+from compact_graph import CompactGraph
+from tabucol import improve_coloring, tabucol as jalankan_tabucol
+
+
+def test_satu_edge_dengan_nilai_default():
+    G = CompactGraph.from_edges([("A", "B")])
+    coloring, info = improve_coloring(G, {"A": 0, "B": 1})
+    assert coloring == {"A": 0, "B": 1}
+    assert info["akhir"] == 2
+
+
+def test_tabucol_satu_warna():
+    assert jalankan_tabucol([[1], [0]], [0, 1], 1) is None
+    assert jalankan_tabucol([[], []], [0, 1], 1) == [0, 0]
+
+
+def test_berhenti_di_lower_bound(monkeypatch):
+    # Klik 6 simpul sudah diwarnai optimal: tidak ada k-1 yang perlu dicoba
+    G = CompactGraph.from_edges(combinations("ABCDEF", 2))
+    coloring = {v: i for i, v in enumerate("ABCDEF")}
+
+    def tidak_boleh(*args, **kwargs):
+        raise AssertionError("tabucol tidak boleh dipanggil")
+
+    monkeypatch.setattr(tabucol, "tabucol", tidak_boleh)
+    hasil, info = improve_coloring(G, coloring, target_k=5, lower_bound=6)
+    assert hasil == coloring
+    assert info["akhir"] == 6
+
+
+def test_turun_sampai_lower_bound():
+    # Lingkaran genap diwarnai boros 4 warna; bisa turun ke 2
+    edges = [(i, (i + 1) % 8) for i in range(8)]
+    G = CompactGraph.from_edges(edges)
+    coloring, info = improve_coloring(G, {i: i % 4 for i in range(8)}, lower_bound=2)
+    assert info["akhir"] == 2
+    assert all(coloring[u] != coloring[v] for u, v in edges)
@@ -0,0 +1,191 @@
+# === Visualisasi graf di luar jalur request ===
+# Gambar PNG dirender oleh satu thread latar (matplotlib tidak thread-safe) dan
+# disimpan di cache dengan kunci hash graf + pewarnaan + judul + mode. Kunci
+# yang sama dipakai sebagai ETag, jadi browser cukup revalidasi dengan
+# If-None-Match. Posisi simpul dari layout.py; graf besar digambar tanpa label
+# dengan edge tersampel, atau sebagai quotient per slot.
+import hashlib
+import io
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import networkx as nx
+import numpy as np
+
+from cache import TTLCache
+from compact_graph import as_compact
+from layout import ego_graph, layout_graph, quotient_graph
+from metrics import span
+
+# Di atas GAMBAR_MAKS simpul mode auto menggambar quotient per slot; label
+# hanya untuk graf <= LABEL_MAKS; edge yang digambar dibatasi EDGE_MAKS
+GAMBAR_MAKS = 3000
+LABEL_MAKS = 150
+EDGE_MAKS = 20000
+
+png_cache = TTLCache(maxsize=16, ttl=600)
+_executor = None
+_sedang = {}
+_lock = threading.Lock()
+
+
+def graph_hash(g, coloring, title="", lod="auto", kode=None):
+    h = hashlib.sha1()
+    h.update(f"{title}\0{lod}\0{kode}".encode())
+    h.update("\0".join(map(str, g.nodes)).encode())
+    h.update(g.indptr.tobytes())
+    h.update(g.indices.tobytes())
+    h.update(repr(g.cliques).encode())
+    h.update(repr([coloring.get(node, 0) for node in g.nodes]).encode())
+    return h.hexdigest()
+
+
+def _pyplot():
+    # matplotlib baru diimpor saat render pertama: worker pool mengimpor ulang
+    # app.py (dan modul ini) tanpa pernah menggambar
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _pasangan_gambar(g, maks, seed=0):
+    # Edge yang digambar, disampel bila lebih dari `maks`. Klik ruangan
+    # digambar sebagai bintang ke anggota pertama (sama dengan kanvas dan
+    # layout.py), bukan O(k²) pasangan
+    pasangan = list(g.edges())
+    for q in g.cliques:
+        pasangan.extend((q[0], v) for v in q[1:])
+    if len(pasangan) > maks:
+        pasangan = random.Random(seed).sample(pasangan, maks)
+    return pasangan
+
+
+def _gambar_quotient(ax, G, coloring):
+    plt = _pyplot()
+    Q = quotient_graph(G, coloring)
+    pos = nx.circular_layout(sorted(Q.nodes))
+    maks_w = max((w for _, _, w in Q.edges(data="weight")), default=1)
+    nx.draw_networkx_edges(Q, pos, ax=ax, width=[0.5 + 6 * w / maks_w for _, _, w in Q.edges(data="weight")],
+                           alpha=0.4)
+    slots = sorted(Q.nodes)
+    nx.draw_networkx_nodes(Q, pos, ax=ax, nodelist=slots, node_color=slots, cmap=plt.cm.Set3,
+                           node_size=[300 + 100 * Q.nodes[s]["ukuran"] ** 0.5 for s in slots])
+    nx.draw_networkx_labels(Q, pos, ax=ax, labels={s: f"Slot {s + 1}\n{Q.nodes[s]['ukuran']} MK" for s in slots},
+                            font_size=9)
+
+
+def render_png(G, coloring, title="Visualisasi Pewarnaan Graf", lod="auto", kode=None, persist=True):
+    # lod: "penuh" = semua MK, "slot" = graf quotient per slot, "ego" = MK
+    # `kode` dan tetangganya, "auto" = quotient bila graf > GAMBAR_MAKS.
+    # persist=False: posisi tidak dibaca/ditulis ke file layout (benchmark)
+    plt = _pyplot()
+    from matplotlib.collections import LineCollection
+
+    g = as_compact(G)
+    if lod == "auto":
+        lod = "slot" if len(g) > GAMBAR_MAKS else "penuh"
+    if lod == "ego":
+        # KeyError bila kode tidak ada di graf; app.py sudah memvalidasinya
+        g = ego_graph(g, kode)
+        title = f"{title} - ego {kode}"
+        persist = False
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot()
+    ax.set_axis_off()
+
+    if lod == "slot":
+        _gambar_quotient(ax, g, coloring)
+    else:
+        pos = layout_graph(g, persist=persist)
+        xy = np.array([pos[node] for node in g.nodes]).reshape(-1, 2)
+        pasangan = _pasangan_gambar(g, EDGE_MAKS)
+        if pasangan:
+            garis = [(xy[u], xy[v]) for u, v in pasangan]
+            ax.add_collection(LineCollection(garis, colors="#999999", linewidths=0.5, alpha=0.5))
+        # Ukuran simpul mengecil seiring jumlah simpul; label hanya untuk graf kecil
+        ukuran = max(10, min(800, 200000 / max(len(g), 1)))
+        colors = [coloring.get(node, 0) for node in g.nodes]
+        ax.scatter(xy[:, 0], xy[:, 1], c=colors, cmap=plt.cm.Set3, s=ukuran, edgecolors="#555555",
+                   linewidths=0.3, zorder=2)
+        if len(g) <= LABEL_MAKS:
+            for node, (x, y) in zip(g.nodes, xy):
+                ax.annotate(str(node), (x, y), ha="center", va="center", fontsize=8, zorder=3)
+        ax.autoscale_view()
+
+    ax.set_title(title)
+    img = io.BytesIO()
+    fig.savefig(img, format='png')
+    plt.close(fig)
+    return img.getvalue()
+
+
+def graph_json(g, coloring, pos, rooms, chunk_size=5000):
+    # JSON ringkas untuk render di browser, dikirim bertahap: array sejajar
+    # per simpul, edge sebagai pasangan indeks, klik ruangan sebagai daftar indeks
+    yield '{"nodes":' + json.dumps(g.nodes)
+    yield ',"slot":' + json.dumps([coloring.get(node, 0) for node in g.nodes])
+    yield ',"x":' + json.dumps([pos[node][0] for node in g.nodes])
+    yield ',"y":' + json.dumps([pos[node][1] for node in g.nodes])
+    yield ',"ruangan":' + json.dumps([rooms.get(node) for node in g.nodes])
+    yield ',"klik":' + json.dumps([list(q) for q in g.cliques])
+    yield ',"edges":['
+    buf = []
+    pertama = True
+    for u, v in g.edges():
+        buf.append(f"[{u},{v}]")
+        if len(buf) == chunk_size:
+            yield ("" if pertama else ",") + ",".join(buf)
+            pertama = False
+            buf = []
+    if buf:
+        yield ("" if pertama else ",") + ",".join(buf)
+    yield ']}'
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+    return _executor
+
+
+def _render(key, G, coloring, title, lod, kode):
+    try:
+        with span("png_render"):
+            png = render_png(G, coloring, title, lod, kode)
+        png_cache.set(key, png)
+        return png
+    finally:
+        with _lock:
+            _sedang.pop(key, None)
+
+
+def request_render(key, G, coloring, title, lod="auto", kode=None):
+    # Antrekan render bila belum ada di cache; permintaan yang sama digabung.
+    # Mengembalikan Future, atau None bila gambar sudah ada.
+    if png_cache.get(key) is not None:
+        return None
+    with _lock:
+        fut = _sedang.get(key)
+        if fut is None:
+            fut = _get_executor().submit(_render, key, G, coloring, title, lod, kode)
+            _sedang[key] = fut
+    return fut
+
+
+def get_png(key, G, coloring, title, lod="auto", kode=None, timeout=10.0):
+    # PNG dari cache, atau tunggu render latar maksimal `timeout` detik
+    # (None bila belum selesai)
+    png = png_cache.get(key)
+    if png is not None:
+        return png
+    fut = request_render(key, G, coloring, title, lod, kode)
+    if fut is None:
+        return png_cache.get(key)
+    try:
+        return fut.result(timeout=timeout)
+    except TimeoutError:
+        return None